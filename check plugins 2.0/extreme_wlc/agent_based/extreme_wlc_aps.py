@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from typing import Dict, NamedTuple, Mapping, List
+from typing import Dict, NamedTuple, Mapping, Optional
 
 from .agent_based_api.v1 import register, Result, Service, SNMPTree, State, TableRow, startswith, any_of
 from .agent_based_api.v1.type_defs import CheckResult, DiscoveryResult, InventoryResult, StringTable
@@ -16,20 +16,15 @@ class WLCAp(NamedTuple):
     sw_ver: str
     serial: str
     location: str
-    clients: str
 
 
 Section = Dict[str, WLCAp]
 
+# Number of associated clients per AP name, see extreme_wlc_ap_clients
+ApClients = Dict[str, int]
 
-def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
-    client_dict = {}
-    for element in string_table[1]:
-        wlanap = str(element[0])
-        if wlanap in client_dict.keys():
-            client_dict[wlanap] += 1
-        else:
-            client_dict[wlanap] = 1
+
+def parse_extreme_wlc_aps(string_table: StringTable) -> Section:
     wlc_dict = {
         ap_name: WLCAp(
             status=ap_status,
@@ -41,7 +36,6 @@ def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
             location=ap_sysloc,
             sw_ver=ap_swversion,
             home_state=ap_homestate,
-            clients=client_dict.get(ap_name, 0),
         )
         for (
             ap_name,
@@ -54,7 +48,7 @@ def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
             ap_sysloc,
             ap_homestate,
             ap_swversion
-        ) in string_table[0]
+        ) in string_table
     }
     return wlc_dict
 
@@ -68,8 +62,7 @@ register.snmp_section(
     name="extreme_wlc_aps",
     parse_function=parse_extreme_wlc_aps,
     detect=DETECT_EXTREM_WLC,
-    fetch=[
-      SNMPTree(
+    fetch=SNMPTree(
         base=".1.3.6.1.4.1.4329.15.3.5.1.2.1",
         oids=[
             "2",   # Name
@@ -83,14 +76,7 @@ register.snmp_section(
             "20",  # HomeState
             "7",   # SWVersion
         ],
-      ),
-      SNMPTree(
-        base=".1.3.6.1.4.1.4329.15.3.6.2.1",
-        oids=[
-            "12",  # AP Client is connected to
-        ],
-      ),
-    ],
+    ),
 )
 
 # AP Name	    .1.3.6.1.4.1.4329.15.3.5.1.2.1.2
@@ -107,13 +93,15 @@ register.snmp_section(
 # AP SecureTun  .1.3.6.1.4.1.4329.15.3.5.1.2.1.41
 # AP SSH enab   .1.3.6.1.4.1.4329.15.3.5.1.2.1.43
 
-def discover_extreme_wlc_aps(section: Section) -> DiscoveryResult:
-    for ap_name, ap_data in section.items():
+def discover_extreme_wlc_aps(section_extreme_wlc_aps: Optional[Section],
+                             section_extreme_wlc_ap_clients: Optional[ApClients]) -> DiscoveryResult:
+    for ap_name in section_extreme_wlc_aps or {}:
         yield Service(item=ap_name)
 
 
-def check_extreme_wlc_aps(item: str, section: Section) -> CheckResult:
-    if item not in section:
+def check_extreme_wlc_aps(item: str, section_extreme_wlc_aps: Optional[Section],
+                          section_extreme_wlc_ap_clients: Optional[ApClients]) -> CheckResult:
+    if not section_extreme_wlc_aps or item not in section_extreme_wlc_aps:
         return
 
     map_state = {
@@ -124,11 +112,12 @@ def check_extreme_wlc_aps(item: str, section: Section) -> CheckResult:
         "1": "local",
         "2": "foreign",
     }
-    ap_data = section[item]
+    ap_data = section_extreme_wlc_aps[item]
     state, state_readable = map_state[ap_data.status]
     infotext = "Status: %s" % state_readable
-    if ap_data.clients:
-        infotext += ", Clients: %s" % ap_data.clients
+    clients = (section_extreme_wlc_ap_clients or {}).get(item)
+    if clients:
+        infotext += ", Clients: %s" % clients
     if ap_data.zone:
         infotext += ", Zone: %s" % ap_data.zone
     if ap_data.location:
@@ -147,10 +136,11 @@ def check_extreme_wlc_aps(item: str, section: Section) -> CheckResult:
         )
 
 
-def cluster_check_extreme_wlc_aps(item: str, section: Mapping[str, Section]) -> CheckResult:
+def cluster_check_extreme_wlc_aps(item: str, section_extreme_wlc_aps: Mapping[str, Optional[Section]],
+                                  section_extreme_wlc_ap_clients: Mapping[str, Optional[ApClients]]) -> CheckResult:
     found = []
-    for node, node_section in section.items():
-        results = list(check_extreme_wlc_aps(item, node_section))
+    for node, node_section in section_extreme_wlc_aps.items():
+        results = list(check_extreme_wlc_aps(item, node_section, section_extreme_wlc_ap_clients.get(node)))
         if results:
             found.append((node, results[0]))
 
@@ -169,6 +159,7 @@ def cluster_check_extreme_wlc_aps(item: str, section: Mapping[str, Section]) ->
 register.check_plugin(
     name="extreme_wlc_aps",
     service_name="AP %s",
+    sections=["extreme_wlc_aps", "extreme_wlc_ap_clients"],
     discovery_function=discover_extreme_wlc_aps,
     check_function=check_extreme_wlc_aps,
     cluster_check_function=cluster_check_extreme_wlc_aps,
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import re
-from typing import List
+from typing import Dict, List
 
 from .agent_based_api.v1 import startswith, register, SNMPTree, OIDEnd, any_of
 from .agent_based_api.v1.type_defs import StringTable
@@ -56,3 +56,27 @@ register.snmp_section(
         ),
     ],
 )
+
+
+def parse_extreme_wlc_ap_clients(string_table: StringTable) -> Dict[str, int]:
+    clients_per_ap: Dict[str, int] = {}
+    for (ap_name,) in string_table:
+        clients_per_ap[ap_name] = clients_per_ap.get(ap_name, 0) + 1
+    return clients_per_ap
+
+
+# The client table has one row per associated client and is by far the most
+# expensive walk on large controllers. It is kept out of extreme_wlc_aps, so
+# it can be fetched less often with the rule "SNMP section check interval".
+# Until the next fetch the AP services show the cached client counts.
+register.snmp_section(
+    name="extreme_wlc_ap_clients",
+    detect=DETECT_EXTREM_WLC,
+    parse_function=parse_extreme_wlc_ap_clients,
+    fetch=SNMPTree(
+        base=".1.3.6.1.4.1.4329.15.3.6.2.1",
+        oids=[
+            "12",  # AP Client is connected to
+        ],
+    ),
+)
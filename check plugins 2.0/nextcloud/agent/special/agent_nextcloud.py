@@ -64,7 +64,7 @@ def main(argv=None):
     else:
         response = requests.get(url, auth=HTTPBasicAuth(args.username, args.password))
     json_response = json.loads(response.text)
-    print(json_response)
+    print(json.dumps(json_response))
 
 
 if __name__ == '__main__':
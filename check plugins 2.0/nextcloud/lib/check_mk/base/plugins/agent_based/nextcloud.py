@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # -*- encoding: utf-8; py-indent-offset: 4 -*-
+import ast
 import json
 from .agent_based_api.v1.type_defs import (
     CheckResult,
@@ -27,7 +28,11 @@ def parse_nextcloud(string_table):
         "activeusers": {},
     }
 
-    parsed = json.loads(string_table[0][0])
+    try:
+        parsed = json.loads(string_table[0][0])
+    except ValueError:
+        # Older agents printed the Python representation of the response
+        parsed = ast.literal_eval(string_table[0][0])
     nextcloud = parsed.get("ocs").get("data").get("nextcloud")
     parsed.setdefault("nextcloud", nextcloud)
     server = parsed.get("ocs").get("data").get("server")
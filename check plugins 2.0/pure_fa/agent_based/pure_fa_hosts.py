@@ -4,18 +4,18 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 # ported by (c) Andreas Doehler <andreas.doehler@bechtle.com/andreas.doehler@gmail.com>
-import ast
 from typing import Any, Dict, Mapping
 
 from .agent_based_api.v1 import register, render, Result, Service, State
 from .agent_based_api.v1.type_defs import CheckResult, DiscoveryResult, StringTable
+from .utils.pure_fa import parse_pure_fa_entries
 
 Section = Dict[str, Mapping[str, Any]]
 
 
 def parse_pure_fa_hosts(string_table: StringTable) -> Section:
     parsed: Section = {}
-    data = ast.literal_eval(string_table[0][0])
+    data = parse_pure_fa_entries(string_table)
     for element in data:
         parsed.setdefault(element.get("name", "unknown"), element)
     return parsed
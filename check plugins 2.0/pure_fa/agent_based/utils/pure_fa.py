@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+import ast
+import json
+from typing import Any, List
+
+from ..agent_based_api.v1.type_defs import StringTable
+
+
+def parse_pure_fa_entries(string_table: StringTable) -> List[Any]:
+    """The agent writes one JSON object per line. Older agents wrote the Python
+    representation of the whole list in a single line, both are accepted."""
+    entries: List[Any] = []
+    for line in string_table:
+        try:
+            data = json.loads(line[0])
+        except ValueError:
+            data = ast.literal_eval(line[0])
+        if isinstance(data, list):
+            entries.extend(data)
+        else:
+            entries.append(data)
+    return entries
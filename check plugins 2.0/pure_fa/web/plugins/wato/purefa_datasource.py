@@ -19,6 +19,8 @@ from cmk.gui.valuespec import (
     Dictionary,
     TextAscii,
     Password,
+    ListChoice,
+    Integer,
 )
 
 from cmk.gui.plugins.wato import (
@@ -41,8 +43,50 @@ def _valuespec_special_agents_purefa():
                 title=_("Password"),
                 allow_empty=False,
             )),
+            ("sections", ListChoice(
+                title = _("Retrieve information about..."),
+                choices = [
+                    ("hw", _("Hardware components")),
+                    ("drives", _("Drives")),
+                    ("hosts", _("Hosts")),
+                    ("network", _("Network interfaces")),
+                    ("volumes", _("Volumes")),
+                    ("vgroups", _("Volume groups")),
+                    ("pods", _("Pods")),
+                    ("pgroups", _("Protection groups")),
+                    ("hgroups", _("Host groups")),
+                    ("alerts", _("Open alerts")),
+                    ("occ", _("Capacity")),
+                    ("performance", _("Performance")),
+                ],
+                default_value = [
+                    "hw", "drives", "hosts", "network", "volumes", "vgroups",
+                    "pods", "pgroups", "hgroups", "alerts", "occ", "performance",
+                ],
+                allow_empty = False,
+            )),
+            ("timeout", Integer(
+                title = _("Advanced - Timeout"),
+                help = _("Sections which are not fetched after this time are left out "
+                         "of the agent output"),
+                unit = _("seconds"),
+                default_value = 30,
+                minvalue = 1,
+            )),
+            ("request_timeout", Integer(
+                title = _("Advanced - Timeout per REST call"),
+                unit = _("seconds"),
+                default_value = 10,
+                minvalue = 1,
+            )),
+            ("max_parallel", Integer(
+                title = _("Advanced - Concurrent REST calls"),
+                default_value = 4,
+                minvalue = 1,
+                maxvalue = 10,
+            )),
         ],
-        optional_keys=False,
+        optional_keys=["sections", "timeout", "request_timeout", "max_parallel"],
     )
 
 
@@ -14,7 +14,9 @@
 # to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
 # Boston, MA 02110-1301 USA.
 
-from typing import Optional, NamedTuple, Tuple
+import ast
+import json
+from typing import Any, Optional, NamedTuple, Tuple
 from ..agent_based_api.v1.type_defs import (
     DiscoveryResult,
 )
@@ -34,25 +36,31 @@ class Perfdata(NamedTuple):
     boundaries: Optional[Tuple[Optional[float], Optional[float]]]
 
 
+def load_section_line(line: str) -> Any:
+    """The agent writes JSON, older agent versions the Python representation"""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ast.literal_eval(line)
+
+
 def parse_dell_idrac_rf(string_table):
-    import ast
     parsed = {}
     list = []
     if len(string_table) == 1:
-        parsed = ast.literal_eval(string_table[0][0])
+        parsed = load_section_line(string_table[0][0])
         return parsed
     else:
         for line in string_table:
-            parsed = ast.literal_eval(line[0])
+            parsed = load_section_line(line[0])
             list.append(parsed)
         return list
 
 
 def parse_dell_idrac_rf_multiple(string_table):
-    import ast
     parsed = {}
     for line in string_table:
-        entry = ast.literal_eval(line[0])
+        entry = load_section_line(line[0])
         parsed.setdefault(entry.get("Id"), entry)
 
     return parsed
@@ -14,6 +14,20 @@
 # to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
 # Boston, MA 02110-1301 USA.
 
+import ast
+import json
+from typing import Any
+
+
+def load_section_line(line: str) -> Any:
+    # Agents before the switch to JSON printed the Python dict of the response
+
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ast.literal_eval(line)
+
+
 def parse_dell_powervault_me4(string_table):
     items = {
         "controllers": "durable-id",
@@ -30,15 +44,15 @@ def parse_dell_powervault_me4(string_table):
         "port": "durable-id",
     }
     parsed = {}
-    import ast
-    data = ast.literal_eval(string_table[0][0])
-
-    for key, dev_id in items.items():
-        if data.get(key, False):
-            elements = data.get(key)
-            for element in elements:
-                item = element.get(dev_id)
-                if item:
-                    parsed.setdefault(item, element)
+    for line in string_table:
+        data = load_section_line(line[0])
+
+        for key, dev_id in items.items():
+            if data.get(key, False):
+                elements = data.get(key)
+                for element in elements:
+                    item = element.get(dev_id)
+                    if item:
+                        parsed.setdefault(item, element)
 
     return parsed
@@ -4,7 +4,7 @@
 # (c) Andreas Doehler <andreas.doehler@bechtle.com/andreas.doehler@gmail.com>
 # License: GNU General Public License v2
 
-from typing import Dict, NamedTuple, Mapping, List, Optional
+from typing import Dict, NamedTuple, Mapping, Optional
 
 from .agent_based_api.v1 import (
     register,
@@ -34,20 +34,15 @@ class WLCAp(NamedTuple):
     sw_ver: str
     serial: str
     location: str
-    clients: str
 
 
 Section = Dict[str, WLCAp]
 
+# Number of associated clients per AP name, see extreme_wlc_ap_clients
+ApClients = Dict[str, int]
 
-def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
-    client_dict = {}
-    for element in string_table[1]:
-        wlanap = str(element[0])
-        if wlanap in client_dict.keys():
-            client_dict[wlanap] += 1
-        else:
-            client_dict[wlanap] = 1
+
+def parse_extreme_wlc_aps(string_table: StringTable) -> Section:
     wlc_dict = {
         ap_name: WLCAp(
             status=ap_status,
@@ -59,7 +54,6 @@ def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
             location=ap_sysloc,
             sw_ver=ap_swversion,
             home_state=ap_homestate,
-            clients=client_dict.get(ap_name, 0),
         )
         for (
             ap_name,
@@ -72,7 +66,7 @@ def parse_extreme_wlc_aps(string_table: List[StringTable]) -> Section:
             ap_sysloc,
             ap_homestate,
             ap_swversion,
-        ) in string_table[0]
+        ) in string_table
     }
     return wlc_dict
 
@@ -87,29 +81,21 @@ register.snmp_section(
     name="extreme_wlc_aps",
     parse_function=parse_extreme_wlc_aps,
     detect=DETECT_EXTREM_WLC,
-    fetch=[
-        SNMPTree(
-            base=".1.3.6.1.4.1.4329.15.3.5.1.2.1",
-            oids=[
-                "2",  # Name
-                "22",  # Status
-                "23",  # Unprovisioned
-                "14",  # IpAddress
-                "33",  # Zone
-                "17",  # HWVersion
-                "4",  # SerialNumber
-                "30",  # Location
-                "20",  # HomeState
-                "7",  # SWVersion
-            ],
-        ),
-        SNMPTree(
-            base=".1.3.6.1.4.1.4329.15.3.6.2.1",
-            oids=[
-                "12",  # AP Client is connected to
-            ],
-        ),
-    ],
+    fetch=SNMPTree(
+        base=".1.3.6.1.4.1.4329.15.3.5.1.2.1",
+        oids=[
+            "2",  # Name
+            "22",  # Status
+            "23",  # Unprovisioned
+            "14",  # IpAddress
+            "33",  # Zone
+            "17",  # HWVersion
+            "4",  # SerialNumber
+            "30",  # Location
+            "20",  # HomeState
+            "7",  # SWVersion
+        ],
+    ),
 )
 
 # AP Name       .1.3.6.1.4.1.4329.15.3.5.1.2.1.2
@@ -127,16 +113,23 @@ register.snmp_section(
 # AP SSH enab   .1.3.6.1.4.1.4329.15.3.5.1.2.1.43
 
 
-def discover_extreme_wlc_aps(section: Section) -> DiscoveryResult:
-    for ap_name, _ap_data in section.items():
+def discover_extreme_wlc_aps(
+    section_extreme_wlc_aps: Optional[Section],
+    section_extreme_wlc_ap_clients: Optional[ApClients],
+) -> DiscoveryResult:
+    for ap_name in section_extreme_wlc_aps or {}:
         yield Service(item=ap_name)
 
 
-def check_extreme_wlc_aps(item: str, section: Optional[Section]) -> CheckResult:
-    if not section:
+def check_extreme_wlc_aps(
+    item: str,
+    section_extreme_wlc_aps: Optional[Section],
+    section_extreme_wlc_ap_clients: Optional[ApClients],
+) -> CheckResult:
+    if not section_extreme_wlc_aps:
         return
 
-    ap_data = section.get(item)
+    ap_data = section_extreme_wlc_aps.get(item)
     if not ap_data:
         return
 
@@ -151,8 +144,9 @@ def check_extreme_wlc_aps(item: str, section: Optional[Section]) -> CheckResult:
 
     state, state_readable = map_state[ap_data.status]
     infotext = f"Status: {state_readable}"
-    if ap_data.clients:
-        infotext += f", Clients: {ap_data.clients}"
+    clients = (section_extreme_wlc_ap_clients or {}).get(item)
+    if clients:
+        infotext += f", Clients: {clients}"
     if ap_data.zone:
         infotext += f", Zone: {ap_data.zone}"
     if ap_data.location:
@@ -172,11 +166,17 @@ def check_extreme_wlc_aps(item: str, section: Optional[Section]) -> CheckResult:
 
 
 def cluster_check_extreme_wlc_aps(
-    item: str, section: Mapping[str, Optional[Section]]
+    item: str,
+    section_extreme_wlc_aps: Mapping[str, Optional[Section]],
+    section_extreme_wlc_ap_clients: Mapping[str, Optional[ApClients]],
 ) -> CheckResult:
     found = []
-    for node, node_section in section.items():
-        results = list(check_extreme_wlc_aps(item, node_section))
+    for node, node_section in section_extreme_wlc_aps.items():
+        results = list(
+            check_extreme_wlc_aps(
+                item, node_section, section_extreme_wlc_ap_clients.get(node)
+            )
+        )
         if results:
             found.append((node, results[0]))
 
@@ -197,6 +197,7 @@ def cluster_check_extreme_wlc_aps(
 register.check_plugin(
     name="extreme_wlc_aps",
     service_name="AP %s",
+    sections=["extreme_wlc_aps", "extreme_wlc_ap_clients"],
     discovery_function=discover_extreme_wlc_aps,
     check_function=check_extreme_wlc_aps,
     cluster_check_function=cluster_check_extreme_wlc_aps,
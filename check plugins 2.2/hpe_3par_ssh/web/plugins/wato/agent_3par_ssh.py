@@ -60,6 +60,20 @@ def _valuespec_special_agents_3par_ssh():
                     ),
                 ),
             ),
+            (
+                "multiplex",
+                Checkbox(
+                    title=_("Use a single SSH connection"),
+                    label=_("Run all commands over one persistent SSH connection"),
+                    default_value=False,
+                    help=_(
+                        "Opens one SSH connection (OpenSSH ControlMaster) and runs all "
+                        "show commands over it. The connection is kept open for three "
+                        "minutes and reused by the following agent calls. This avoids "
+                        "the slow login on the storage system for every command."
+                    ),
+                ),
+            ),
             (
                 "infos",
                 Transform(
@@ -71,6 +85,10 @@ def _valuespec_special_agents_3par_ssh():
                             ("showvv", _("MDisksGrps")),
                             ("showps", _("IO Groups")),
                             ("shownode", _("Node Stats")),
+                            ("statvv", _("VV performance (statvv)")),
+                            ("statport", _("Port performance (statport)")),
+                            ("statpd", _("Disk performance (statpd)")),
+                            ("statcpu", _("Node CPU utilization (statcpu)")),
                         ],
                         default_value=[
                             "showcage",
@@ -86,7 +104,7 @@ def _valuespec_special_agents_3par_ssh():
                 ),
             ),
         ],
-        optional_keys=["infos", "accept-any-hostkey"],
+        optional_keys=["infos", "accept-any-hostkey", "multiplex"],
     )
 
 
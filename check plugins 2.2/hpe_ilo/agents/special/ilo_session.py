@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+"""Session persistence for the special agents
+
+The session of a run is stored below tmp/agents/<agent>/<host>.json and
+reused by the next run instead of a new login.
+
+The same module ships as idrac_session.py (dell_idrac_redfish), ilo_session.py
+(hpe_ilo), xclarity_session.py (lenovo_xclarity) and powervault_session.py
+(dell_powervault_me4). The packages are installed independently and a file
+can only belong to one package, so every package carries its own copy under
+its own name. Keep the copies identical.
+"""
+
+import json
+
+from cmk.utils import paths, store
+
+
+def _store_path(agent, host):
+    return paths.tmp_dir / "agents" / agent / f"{host}.json"
+
+
+def store_session(agent, host, data):
+    """save session data to file"""
+    store.save_text_to_file(_store_path(agent, host), json.dumps(data))
+
+
+def load_session(agent, host):
+    """load stored session data, an empty dict if nothing is stored"""
+    return json.loads(store.load_text_from_file(_store_path(agent, host), default="{}"))
+
+
+def store_session_key(redfishobj, agent, host):
+    """save the session of a redfish client object"""
+    store_session(
+        agent,
+        host,
+        {
+            "location": redfishobj.get_session_location(),
+            "session": redfishobj.get_session_key(),
+        },
+    )
+
+
+def load_session_key(agent, host):
+    """load existing redfish session data"""
+    data = load_session(agent, host)
+    if data.get("session") and data.get("location"):
+        return data
+    return None
+
+
+def _new_session(redfishobj):
+    # cleanup old session information
+    redfishobj.set_session_location(None)
+    redfishobj.set_session_key(None)
+    redfishobj.login(auth="session")
+
+
+def login_session(redfishobj, agent, host):
+    """reuse the stored session if it is still valid, login otherwise"""
+    existing_session = load_session_key(agent, host)
+    if existing_session:
+        redfishobj.set_session_location(existing_session.get("location"))
+        redfishobj.set_session_key(existing_session.get("session"))
+        response = redfishobj.get("/redfish/v1/SessionService/Sessions", None)
+        if response.status == 200:
+            return
+    _new_session(redfishobj)
+    store_session_key(redfishobj, agent, host)
+
+
+def redfish_get(redfishobj, url, args=None):
+    """fetch an url, an expired session is replaced by a new login"""
+    response = redfishobj.get(url, args)
+    if response.status == 401 and redfishobj.get_session_key():
+        _new_session(redfishobj)
+        response = redfishobj.get(url, args)
+    return response
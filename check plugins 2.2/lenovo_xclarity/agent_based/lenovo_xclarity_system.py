@@ -18,7 +18,6 @@
 # Example Output:
 #
 #
-import ast
 from typing import Any, Dict, Mapping
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import (
     CheckResult,
@@ -31,14 +30,14 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Service,
 )
 
-from .utils.lenovo_xclarity import xclarity_health_state
+from .utils.lenovo_xclarity import load_section_line, xclarity_health_state
 
 Section = Dict[str, Mapping[str, Any]]
 
 
 def parse_lenovo_xclarity_system(string_table) -> Section:
     parsed = {}
-    parsed = ast.literal_eval(string_table[0][0])
+    parsed = load_section_line(string_table[0][0])
     return parsed
 
 
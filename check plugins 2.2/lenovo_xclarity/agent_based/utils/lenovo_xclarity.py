@@ -14,6 +14,7 @@
 # to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
 # Boston, MA 02110-1301 USA.
 import ast
+import json
 from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple, TypedDict, Union
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import (
     DiscoveryResult,
@@ -80,9 +81,17 @@ class Perfdata(NamedTuple):
     boundaries: Optional[Tuple[Optional[float], Optional[float]]]
 
 
+def load_section_line(line: str) -> Any:
+    """Sections are written as JSON, the Python repr of older agents is still accepted"""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ast.literal_eval(line)
+
+
 def parse_lenovo_xclarity(string_table) -> Section:
     parsed = {}
-    data = ast.literal_eval(string_table[0][0])
+    data = load_section_line(string_table[0][0])
     for element in data:
         device = element.get("Name", "Unknown")
         parsed.setdefault(device, element)
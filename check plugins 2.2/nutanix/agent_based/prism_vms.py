@@ -15,15 +15,14 @@ from typing import Any, Dict, Mapping
 
 from cmk.base.plugins.agent_based.agent_based_api.v1 import register, render, Result, Service, State
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import CheckResult, DiscoveryResult, StringTable
-from .utils.prism import PRISM_POWER_STATES, load_json
+from .utils.prism import PRISM_POWER_STATES, load_json_entities
 
 Section = Dict[str, Mapping[str, Any]]
 
 
 def parse_prism_vms(string_table: StringTable) -> Section:
     parsed: Section = {}
-    data = load_json(string_table)
-    for element in data.get("entities", {}):
+    for element in load_json_entities(string_table):
         parsed.setdefault(element.get("vmName", "unknown"), element)
     return parsed
 
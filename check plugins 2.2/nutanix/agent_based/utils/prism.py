@@ -12,7 +12,7 @@
 # to the Free Software Foundation, Inc., 51 Franklin St,  Fifth Floor,
 # Boston, MA 02110-1301 USA.
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 from ..agent_based_api.v1.type_defs import StringTable
 
@@ -40,3 +40,13 @@ def load_json(string_table: StringTable) -> PrismAPIData:
         return json.loads(string_table[0][0])
     except (IndexError, json.decoder.JSONDecodeError):
         return {}
+
+
+def load_json_entities(string_table: StringTable) -> Iterable[PrismAPIData]:
+    """entities of a paged section, every line holds the result of one page"""
+    for line in string_table:
+        try:
+            data = json.loads(line[0])
+        except (IndexError, json.decoder.JSONDecodeError):
+            continue
+        yield from data.get("entities", [])
@@ -3,9 +3,12 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import json
 import logging
 import sys
-from typing import Optional, Sequence
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence
 
 from cmk.special_agents.utils.agent_common import (
     ConditionalPiggybackSection,
@@ -14,9 +17,25 @@ from cmk.special_agents.utils.agent_common import (
 )
 from cmk.special_agents.utils.argument_parsing import Args, create_default_argument_parser
 from cmk.special_agents.utils.request_helper import HTTPSAuthRequester, Requester
+from cmk.utils import paths, store
 
 LOGGING = logging.getLogger("agent_prism")
 
+SECTIONS = [
+    "containers",
+    "alerts",
+    "cluster",
+    "storage_pools",
+    "vms",
+    "hosts",
+    "protection_domains",
+    "remote_support",
+    "ha",
+]
+
+# endpoints which change seldom and can be served from the local cache
+CACHED_SECTIONS = ["cluster", "remote_support", "ha"]
+
 
 def parse_arguments(argv: Optional[Sequence[str]]) -> Args:
     parser = create_default_argument_parser(description=__doc__)
@@ -36,10 +55,74 @@ def parse_arguments(argv: Optional[Sequence[str]]) -> Args:
     parser.add_argument(
         "--password", type=str, required=True, metavar="PASSWORD", help="password for that account"
     )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=500,
+        help="Number of VMs fetched with one request (default=500)",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=4,
+        help="Maximum number of parallel requests for per host data (default=4)",
+    )
+    parser.add_argument(
+        "--sections",
+        type=str,
+        default=",".join(SECTIONS),
+        help=f"Comma separated list of data to query. Possible values: {','.join(SECTIONS)} "
+        "(default: all)",
+    )
+    parser.add_argument(
+        "--cache-interval",
+        type=int,
+        default=0,
+        help=f"Seconds the data of {','.join(CACHED_SECTIONS)} is served from the local "
+        "cache before it is fetched again (default=0, no caching)",
+    )
 
     return parser.parse_args(argv)
 
 
+class SectionCache:
+    """Cache for the data of seldom changing endpoints of one Prism server"""
+
+    def __init__(self, server: str, interval: int) -> None:
+        self._server = server
+        self._interval = interval
+
+    def _store_path(self, section_name: str):
+        return paths.tmp_dir / "agents" / "agent_prism" / f"{self._server}_{section_name}.json"
+
+    def output(self, requester: Requester, path: str, section_name: str) -> None:
+        """write the section from cache or fetch and cache it if the cache is outdated"""
+        if self._interval <= 0:
+            obj = requester.get(path)
+            with SectionWriter(section_name) as w:
+                w.append_json(obj)
+            return
+
+        cached: Dict[str, Any] = json.loads(
+            store.load_text_from_file(self._store_path(section_name), default="{}")
+        )
+        cached_at = cached.get("timestamp", 0)
+        obj = cached.get("data")
+        if obj is None or time.time() - cached_at >= self._interval:
+            LOGGING.debug("refresh cached %s..", section_name)
+            obj = requester.get(path)
+            cached_at = time.time()
+            store.save_text_to_file(
+                self._store_path(section_name),
+                json.dumps({"timestamp": cached_at, "data": obj}),
+            )
+        # the cached() header lets Checkmk show the age of the data
+        sys.stdout.write(
+            f"<<<{section_name}:sep(0):cached({int(cached_at)},{self._interval})>>>\n"
+        )
+        sys.stdout.write(f"{json.dumps(obj)}\n")
+
+
 def output_containers(requester: Requester) -> None:
     LOGGING.debug("do request..")
     obj = requester.get("containers")
@@ -59,12 +142,9 @@ def output_alerts(requester: Requester) -> None:
         w.append_json(obj)
 
 
-def output_cluster(requester: Requester) -> None:
+def output_cluster(requester: Requester, cache: SectionCache) -> None:
     LOGGING.debug("do request..")
-    obj = requester.get("cluster")
-    LOGGING.debug("got %d keys", len(obj.keys()))
-    with SectionWriter("prism_info") as w:
-        w.append_json(obj)
+    cache.output(requester, "cluster", "prism_info")
 
 
 def output_storage_pools(requester: Requester) -> None:
@@ -75,27 +155,54 @@ def output_storage_pools(requester: Requester) -> None:
         w.append_json(obj)
 
 
-def output_vms(requester: Requester) -> None:
-    obj = requester.get("vms")
-    with SectionWriter("prism_vms") as w:
-        w.append_json(obj)
-    for element in obj.get("entities"):
-        with ConditionalPiggybackSection(element.get("vmName")):
-            with SectionWriter("prism_vm") as w:
-                w.append_json(element)
-
-
-def output_hosts(requester: Requester) -> None:
+def output_vms(requester: Requester, page_size: int) -> None:
+    # every page is written as one line of the prism_vms section followed by the
+    # piggyback data of its VMs, so only one page is kept in memory
+    page = 1
+    fetched = 0
+    while True:
+        LOGGING.debug("do request for page %d..", page)
+        obj = requester.get("vms", parameters={"count": page_size, "page": page})
+        entities = obj.get("entities") or []
+        fetched += len(entities)
+        metadata = obj.get("metadata") or {}
+        total = metadata.get("totalEntities", metadata.get("grandTotalEntities"))
+        LOGGING.debug("got %d vms (%d of %s)", len(entities), fetched, total)
+        with SectionWriter("prism_vms") as w:
+            w.append_json({"entities": entities})
+        for element in entities:
+            with ConditionalPiggybackSection(element.get("vmName")):
+                with SectionWriter("prism_vm") as w:
+                    w.append_json(element)
+        # Prism may return less than page_size VMs per page, the total of the
+        # metadata tells if more pages follow. An empty page always ends the loop
+        if not entities:
+            break
+        if total is None:
+            if len(entities) < page_size:
+                break
+        elif fetched >= total:
+            break
+        page += 1
+
+
+def output_hosts(requester: Requester, max_parallel: int) -> None:
     obj = requester.get("hosts")
     with SectionWriter("prism_hosts") as w:
         w.append_json(obj)
-    for element in obj.get("entities"):
-        with ConditionalPiggybackSection(element.get("name")):
-            with SectionWriter("prism_host") as w:
-                w.append_json(element)
-            networks = requester.get(f"hosts/{element.get('uuid')}/host_nics")
-            with SectionWriter("prism_host_networks") as w:
-                w.append_json(networks)
+    elements = obj.get("entities")
+    LOGGING.debug("fetch nics of %d hosts..", len(elements))
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        host_networks = executor.map(
+            lambda element: requester.get(f"hosts/{element.get('uuid')}/host_nics"),
+            elements,
+        )
+        for element, networks in zip(elements, host_networks):
+            with ConditionalPiggybackSection(element.get("name")):
+                with SectionWriter("prism_host") as w:
+                    w.append_json(element)
+                with SectionWriter("prism_host_networks") as w:
+                    w.append_json(networks)
 
 
 def output_protection(requester: Requester) -> None:
@@ -104,16 +211,12 @@ def output_protection(requester: Requester) -> None:
         w.append_json(obj)
 
 
-def output_support(requester: Requester) -> None:
-    obj = requester.get("cluster/remote_support")
-    with SectionWriter("prism_remote_support") as w:
-        w.append_json(obj)
+def output_support(requester: Requester, cache: SectionCache) -> None:
+    cache.output(requester, "cluster/remote_support", "prism_remote_support")
 
 
-def output_ha(requester: Requester) -> None:
-    obj = requester.get("ha")
-    with SectionWriter("prism_ha") as w:
-        w.append_json(obj)
+def output_ha(requester: Requester, cache: SectionCache) -> None:
+    cache.output(requester, "ha", "prism_ha")
 
 
 def agent_prism_main(args: Args) -> int:
@@ -135,32 +238,44 @@ def agent_prism_main(args: Args) -> int:
         args.password,
     )
 
-    LOGGING.info("fetch and write container info..")
-    output_containers(requester_v1)
+    cache = SectionCache(args.server, args.cache_interval)
+    sections = args.sections.split(",")
+
+    if "containers" in sections:
+        LOGGING.info("fetch and write container info..")
+        output_containers(requester_v1)
 
-    LOGGING.info("fetch and write alerts..")
-    output_alerts(requester_v2)
+    if "alerts" in sections:
+        LOGGING.info("fetch and write alerts..")
+        output_alerts(requester_v2)
 
-    LOGGING.info("fetch and write cluster info..")
-    output_cluster(requester_v2)
+    if "cluster" in sections:
+        LOGGING.info("fetch and write cluster info..")
+        output_cluster(requester_v2, cache)
 
-    LOGGING.info("fetch and write storage_pools..")
-    output_storage_pools(requester_v1)
+    if "storage_pools" in sections:
+        LOGGING.info("fetch and write storage_pools..")
+        output_storage_pools(requester_v1)
 
-    LOGGING.info("fetch and write vm info..")
-    output_vms(requester_v1)
+    if "vms" in sections:
+        LOGGING.info("fetch and write vm info..")
+        output_vms(requester_v1, args.page_size)
 
-    LOGGING.info("fetch and write hosts info..")
-    output_hosts(requester_v2)
+    if "hosts" in sections:
+        LOGGING.info("fetch and write hosts info..")
+        output_hosts(requester_v2, args.max_parallel)
 
-    LOGGING.info("fetch and write protection domain info..")
-    output_protection(requester_v2)
+    if "protection_domains" in sections:
+        LOGGING.info("fetch and write protection domain info..")
+        output_protection(requester_v2)
 
-    LOGGING.info("fetch and write support info..")
-    output_support(requester_v2)
+    if "remote_support" in sections:
+        LOGGING.info("fetch and write support info..")
+        output_support(requester_v2, cache)
 
-    LOGGING.info("fetch and write ha state..")
-    output_ha(requester_v2)
+    if "ha" in sections:
+        LOGGING.info("fetch and write ha state..")
+        output_ha(requester_v2, cache)
 
     LOGGING.info("all done. bye.")
 
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# (c) Andreas Doehler <andreas.doehler@bechtle.com/andreas.doehler@gmail.com>
+
+# License: GNU General Public License v2
+
+# Replaces the built-in "special_agents:prism" rule. The parameters of the
+# built-in rule are kept, so existing rules stay valid.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.special_agents.common import RulespecGroupVMCloudContainer
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    IndividualOrStoredPassword,
+    rulespec_registry,
+)
+from cmk.gui.valuespec import Age, Dictionary, Integer, ListChoice, TextInput
+
+
+def _valuespec_special_agents_prism():
+    return Dictionary(
+        title=_("Nutanix Prism"),
+        elements=[
+            (
+                "port",
+                Integer(
+                    title=_("TCP port for connection"),
+                    default_value=9440,
+                    minvalue=1,
+                    maxvalue=65535,
+                ),
+            ),
+            (
+                "username",
+                TextInput(
+                    title=_("User ID for web login"),
+                    allow_empty=False,
+                ),
+            ),
+            (
+                "password",
+                IndividualOrStoredPassword(
+                    title=_("Password for this user"),
+                    allow_empty=False,
+                ),
+            ),
+            (
+                "timeout",
+                Integer(
+                    title=_("Connect timeout"),
+                    help=_("The network timeout in seconds"),
+                    default_value=10,
+                    minvalue=1,
+                    unit=_("seconds"),
+                ),
+            ),
+            (
+                "sections",
+                ListChoice(
+                    title=_("Retrieve information about..."),
+                    choices=[
+                        ("containers", _("Storage containers")),
+                        ("alerts", _("Alerts")),
+                        ("cluster", _("Cluster")),
+                        ("storage_pools", _("Storage pools")),
+                        ("vms", _("Virtual machines")),
+                        ("hosts", _("Hosts")),
+                        ("protection_domains", _("Protection domains")),
+                        ("remote_support", _("Remote support")),
+                        ("ha", _("High availability")),
+                    ],
+                    default_value=[
+                        "containers",
+                        "alerts",
+                        "cluster",
+                        "storage_pools",
+                        "vms",
+                        "hosts",
+                        "protection_domains",
+                        "remote_support",
+                        "ha",
+                    ],
+                    allow_empty=False,
+                ),
+            ),
+            (
+                "page_size",
+                Integer(
+                    title=_("Advanced - VMs per request"),
+                    help=_("Number of VMs fetched with one request."),
+                    default_value=500,
+                    minvalue=1,
+                ),
+            ),
+            (
+                "max_parallel",
+                Integer(
+                    title=_("Advanced - Parallel requests"),
+                    help=_("Maximum number of parallel requests for the data of the hosts."),
+                    default_value=4,
+                    minvalue=1,
+                    maxvalue=32,
+                ),
+            ),
+            (
+                "cache_interval",
+                Age(
+                    title=_("Advanced - Cache interval"),
+                    help=_(
+                        "The data of cluster, remote support and high availability changes "
+                        "seldom. It is served from a local cache for this time before it is "
+                        "fetched again. 0 disables the cache."
+                    ),
+                    default_value=0,
+                ),
+            ),
+        ],
+        optional_keys=["port", "timeout", "sections", "page_size", "max_parallel", "cache_interval"],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupVMCloudContainer,
+        name="special_agents:prism",
+        valuespec=_valuespec_special_agents_prism,
+    )
+)
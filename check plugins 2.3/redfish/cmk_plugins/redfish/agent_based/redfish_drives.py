@@ -31,16 +31,11 @@ def discovery_redfish_drives(section: RedfishAPIData) -> DiscoveryResult:
     for key in section.keys():
         if section[key].get("Status", {}).get("State") == "Absent":
             continue
-        item = section[key].get("Id", "0") + "-" + section[key]["Name"]
-        yield Service(item=item)
+        yield Service(item=key)
 
 
 def check_redfish_drives(item: str, section: RedfishAPIData) -> CheckResult:
-    data = None
-    for key in section.keys():
-        if item == section[key].get("Id", "0") + "-" + section[key]["Name"]:
-            data = section.get(key, None)
-            break
+    data = section.get(item, None)
     if data is None:
         return
 
@@ -21,43 +21,17 @@ from cmk.plugins.redfish.lib import (
 )
 
 
-def _fan_item_name(data):
-    fan_name = data.get("Name", data.get("FanName", None))
-    if fan_name:
-        if fan_name.startswith("Fan"):
-            fan_name = fan_name.lstrip("Fan").strip()
-        return fan_name
-    return None
-
-
 def discovery_redfish_fans(section: RedfishAPIData) -> DiscoveryResult:
     """Discover single fans"""
-    for key in section.keys():
-        fans = section[key].get("Fans", None)
-        for fan in fans:
-            if fan.get("Status", {}).get("State") == "Absent":
-                continue
-            fan_name = _fan_item_name(fan)
-            if fan_name:
-                yield Service(item=fan_name)
+    for item, fan in section.get("Fans", {}).items():
+        if fan.get("Status", {}).get("State") == "Absent":
+            continue
+        yield Service(item=item)
 
 
 def check_redfish_fans(item: str, section: RedfishAPIData) -> CheckResult:
     """Check single fan state"""
-    fan = None
-    for key in section.keys():
-        fans = section[key].get("Fans", None)
-        if fans is None:
-            return
-
-        for fan_data in fans:
-            fan_name = _fan_item_name(fan_data)
-            if fan_name == item:
-                fan = fan_data
-                break
-        if fan:
-            break
-
+    fan = section.get("Fans", {}).get(item)
     if not fan:
         return
 
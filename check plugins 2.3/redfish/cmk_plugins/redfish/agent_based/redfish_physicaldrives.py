@@ -30,22 +30,11 @@ agent_section_redfish_physicaldrives = AgentSection(
 
 def discovery_redfish_physicaldrives(section: RedfishAPIData) -> DiscoveryResult:
     for key in section.keys():
-        loc = section[key].get("Location")
-        if loc == []:
-            item = section[key]["Name"]
-        else:
-            item = section[key]["Location"]
-
-        yield Service(item=item)
+        yield Service(item=key)
 
 
 def check_redfish_physicaldrives(item: str, section: RedfishAPIData) -> CheckResult:
-    data = None
-    for key in section.keys():
-        if item == section[key].get("Location"):
-            data = section.get(key, None)
-        elif item == section[key].get("Name"):
-            data = section.get(key, None)
+    data = section.get(item, None)
     if data is None:
         return
 
@@ -7,11 +7,11 @@
 
 from cmk.agent_based.v2 import AgentSection
 from cmk.plugins.redfish.lib import (
-    parse_redfish_multiple,
+    parse_redfish_power,
 )
 
 agent_section_redfish_power = AgentSection(
     name="redfish_power",
-    parse_function=parse_redfish_multiple,
+    parse_function=parse_redfish_power,
     parsed_section_name="redfish_power",
 )
@@ -21,29 +21,14 @@ from cmk.plugins.redfish.lib import (
 
 
 def discovery_redfish_psu(section: RedfishAPIData) -> DiscoveryResult:
-    for key in section.keys():
-        data = section[key].get("PowerSupplies", None)
-        if data:
-            for count, entry in enumerate(data):
-                if entry.get("Status", {}).get("State") in ["Absent", "Disabled"]:
-                    continue
-                yield Service(item=f"{count}-{entry['Name']}")
+    for item, entry in section.get("PowerSupplies", {}).items():
+        if entry.get("Status", {}).get("State") in ["Absent", "Disabled"]:
+            continue
+        yield Service(item=item)
 
 
 def check_redfish_psu(item: str, section: RedfishAPIData) -> CheckResult:
-    psu = None
-    for key in section.keys():
-        psus = section[key].get("PowerSupplies", None)
-        if psus is None:
-            return
-
-        for count, psu_data in enumerate(psus):
-            if f"{count}-{psu_data.get('Name')}" == item:
-                psu = psu_data
-                break
-        if psu:
-            break
-
+    psu = section.get("PowerSupplies", {}).get(item)
     if not psu:
         return
 
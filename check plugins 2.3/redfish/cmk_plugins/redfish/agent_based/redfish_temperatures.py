@@ -27,32 +27,17 @@ from cmk.plugins.lib.temperature import (
 
 def discovery_redfish_temperatures(section: RedfishAPIData) -> DiscoveryResult:
     """Discover temperature sensors"""
-    for key in section.keys():
-        temps = section[key].get("Temperatures", None)
-        for temp in temps:
-            if temp.get("Status").get("State") in ["Absent", "Disabled"]:
-                continue
-            if temp.get("Name"):
-                yield Service(item=temp.get("Name"))
+    for item, temp in section.get("Temperatures", {}).items():
+        if temp.get("Status").get("State") in ["Absent", "Disabled"]:
+            continue
+        yield Service(item=item)
 
 
 def check_redfish_temperatures(
     item: str, params: TempParamDict, section: RedfishAPIData
 ) -> CheckResult:
     """Check single temperature sensor state"""
-    temp = None
-    for key in section.keys():
-        temps = section[key].get("Temperatures", None)
-        if temps is None:
-            return
-
-        for temp_data in temps:
-            if temp_data.get("Name") == item:
-                temp = temp_data
-                break
-        if temp:
-            break
-
+    temp = section.get("Temperatures", {}).get(item)
     if not temp:
         return
 
@@ -7,11 +7,11 @@
 
 from cmk.agent_based.v2 import AgentSection
 from cmk.plugins.redfish.lib import (
-    parse_redfish_multiple,
+    parse_redfish_thermal,
 )
 
 agent_section_redfish_thermal = AgentSection(
     name="redfish_thermal",
-    parse_function=parse_redfish_multiple,
+    parse_function=parse_redfish_thermal,
     parsed_section_name="redfish_thermal",
 )
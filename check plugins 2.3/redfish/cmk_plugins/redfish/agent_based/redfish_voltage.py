@@ -22,30 +22,14 @@ from cmk.plugins.redfish.lib import (
 
 
 def discovery_redfish_voltage(section: RedfishAPIData) -> DiscoveryResult:
-    for key in section.keys():
-        data = section[key].get("Voltages", None)
-        if not data:
-            return
-        for entry in data:
-            if not entry.get("ReadingVolts"):
-                continue
-            yield Service(item=entry["Name"])
+    for item, entry in section.get("Voltages", {}).items():
+        if not entry.get("ReadingVolts"):
+            continue
+        yield Service(item=item)
 
 
 def check_redfish_voltage(item: str, section: RedfishAPIData) -> CheckResult:
-    voltage = None
-    for key in section.keys():
-        voltages = section[key].get("Voltages", None)
-        if voltages is None:
-            return
-
-        for voltage_data in voltages:
-            if voltage_data.get("Name") == item:
-                voltage = voltage_data
-                break
-        if voltage:
-            break
-
+    voltage = section.get("Voltages", {}).get(item)
     if not voltage:
         return
 
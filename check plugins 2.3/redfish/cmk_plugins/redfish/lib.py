@@ -6,7 +6,7 @@
 # License: GNU General Public License v2
 
 import json
-from typing import Any, Dict, NamedTuple, Optional, Tuple
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 from cmk.agent_based.v2 import DiscoveryResult, Service, StringTable
 
 
@@ -33,19 +33,17 @@ def parse_redfish(string_table: StringTable) -> RedfishAPIData:
 
 
 def parse_redfish_multiple(string_table: StringTable) -> RedfishAPIData:
-    """parse list of device dictionaries to one dictionary"""
-    hpe_matches = [
-        "SmartStorageDiskDrive",
-        "SmartStorageLogicalDrive",
-    ]
-
+    """parse list of device dictionaries to one dictionary
+    with the item names used by the discovery functions as keys"""
     parsed = {}
     for line in string_table:
         entry = json.loads(line[0])
-        if any(x in entry.get("@odata.type") for x in hpe_matches):
+        if "SmartStorageDiskDrive" in entry.get("@odata.type"):
+            item = redfish_item_physicaldrive(entry)
+        elif "SmartStorageLogicalDrive" in entry.get("@odata.type"):
             item = redfish_item_hpe(entry)
         elif "Drive" in entry.get("@odata.type"):
-            item = entry.get("@odata.id")
+            item = redfish_item_drive(entry)
         elif "Power" in entry.get("@odata.type"):
             item = entry.get("@odata.id")
         elif "Thermal" in entry.get("@odata.type"):
@@ -56,6 +54,44 @@ def parse_redfish_multiple(string_table: StringTable) -> RedfishAPIData:
     return parsed
 
 
+def _parse_redfish_sensors(
+    string_table: StringTable, sensor_lists: Dict[str, Callable[[int, Dict], Any]]
+) -> RedfishAPIData:
+    """parse sensor lists of all chassis to one index per sensor list,
+    first sensor with an item name wins like in the old linear search"""
+    parsed: RedfishAPIData = {list_name: {} for list_name in sensor_lists}
+    for line in string_table:
+        entry = json.loads(line[0])
+        for list_name, item_function in sensor_lists.items():
+            for count, sensor in enumerate(entry.get(list_name) or []):
+                item = item_function(count, sensor)
+                if item:
+                    parsed[list_name].setdefault(item, sensor)
+    return parsed
+
+
+def parse_redfish_thermal(string_table: StringTable) -> RedfishAPIData:
+    """parse thermal data of all chassis to temperature and fan index"""
+    return _parse_redfish_sensors(
+        string_table,
+        {
+            "Temperatures": lambda _count, sensor: sensor.get("Name"),
+            "Fans": lambda _count, sensor: redfish_item_fan(sensor),
+        },
+    )
+
+
+def parse_redfish_power(string_table: StringTable) -> RedfishAPIData:
+    """parse power data of all chassis to power supply and voltage index"""
+    return _parse_redfish_sensors(
+        string_table,
+        {
+            "PowerSupplies": lambda count, sensor: f"{count}-{sensor.get('Name')}",
+            "Voltages": lambda _count, sensor: sensor.get("Name"),
+        },
+    )
+
+
 def discovery_redfish_multiple(section: RedfishAPIData) -> DiscoveryResult:
     """Discovery multiple items from one dictionary"""
     for item in section:
@@ -89,6 +125,29 @@ def redfish_item_hpe(section: RedfishAPIData):
     return item
 
 
+def redfish_item_drive(section: RedfishAPIData) -> str:
+    """Item names for drives"""
+    return f"{section.get('Id', '0')}-{section.get('Name')}"
+
+
+def redfish_item_physicaldrive(section: RedfishAPIData):
+    """Item names for HPE physical drives - location or name if no location"""
+    location = section.get("Location")
+    if not location or not isinstance(location, str):
+        return section.get("Name")
+    return location
+
+
+def redfish_item_fan(section: RedfishAPIData) -> Optional[str]:
+    """Item names for fans"""
+    fan_name = section.get("Name", section.get("FanName", None))
+    if fan_name:
+        if fan_name.startswith("Fan"):
+            fan_name = fan_name.lstrip("Fan").strip()
+        return fan_name
+    return None
+
+
 def redfish_health_state(state: Dict[str, Any]):
     """Transfer Redfish health to monitoring health state"""
     health_map: Dict[str, Tuple[int, str]] = {
@@ -5,7 +5,7 @@
 
 # License: GNU General Public License v2
 
-from cmk.rulesets.v1 import Title, Help
+from cmk.rulesets.v1 import Help, Label, Title
 from cmk.rulesets.v1.form_specs import (
     CascadingSingleChoice,
     CascadingSingleChoiceElement,
@@ -173,6 +173,60 @@ def _valuespec_special_agents_redfish() -> Dictionary:
                     custom_validate=validators.InRange(min_value=1, max_value=20),
                 ),
             ),
+            "expand": DictElement(
+                parameter_form=FixedValue(
+                    value=True,
+                    title=Title("Advanced - Fetch expanded collections"),
+                    help_text=Help(
+                        "Query collections with the vendor specific $expand option "
+                        "and use the data view on iLO 5 instead of fetching every "
+                        "member with a separate request."
+                    ),
+                    label=Label("Use $expand and data views"),
+                ),
+            ),
+            "cache_interval": DictElement(
+                parameter_form=Integer(
+                    title=Title("Advanced - Cache interval for static resources"),
+                    help_text=Help(
+                        "System, chassis, manager, processor, memory, firmware and "
+                        "network adapter data is cached on the monitoring server. "
+                        "Within this interval the cached data is used without any "
+                        "request, afterwards it is revalidated with its ETag. "
+                        "These resources also carry the health state of the system "
+                        "and the memory modules, a state change is only seen after "
+                        "the interval. With 0 every resource is revalidated on each "
+                        "run. Power and thermal data is always fetched live."
+                    ),
+                    unit_symbol="s",
+                    prefill=DefaultValue(0),
+                    custom_validate=validators.InRange(min_value=0, max_value=86400),
+                ),
+            ),
+            "disable_cache": DictElement(
+                parameter_form=FixedValue(
+                    value=True,
+                    title=Title("Advanced - Disable resource cache"),
+                    help_text=Help(
+                        "Do not keep resources on the monitoring server and request "
+                        "every resource without ETag. Use this if the management "
+                        "controller does not change the ETag of modified resources."
+                    ),
+                    label=Label("Always fetch all resources"),
+                ),
+            ),
+            "max_parallel": DictElement(
+                parameter_form=Integer(
+                    title=Title("Advanced - Parallel requests"),
+                    help_text=Help(
+                        "Maximum number of requests running at the same time against "
+                        "the management controller. Older iLO and iDRAC versions "
+                        "do not work well with more than 4 parallel requests."
+                    ),
+                    prefill=DefaultValue(4),
+                    custom_validate=validators.InRange(min_value=1, max_value=16),
+                ),
+            ),
         },
     )
 
@@ -28,6 +28,10 @@ class Params(BaseModel):
     sections: list | None = None
     timeout: int | None = None
     retries: int | None = None
+    max_parallel: int | None = None
+    expand: bool = False
+    cache_interval: int | None = None
+    disable_cache: bool = False
 
 
 def _agent_redfish_arguments(
@@ -48,6 +52,14 @@ def _agent_redfish_arguments(
         command_arguments += ["--timeout", params.timeout]
     if params.retries is not None:
         command_arguments += ["--retries", params.retries]
+    if params.expand:
+        command_arguments.append("--expand")
+    if params.cache_interval is not None:
+        command_arguments += ["--cache-interval", str(params.cache_interval)]
+    if params.disable_cache:
+        command_arguments.append("--disable-cache")
+    if params.max_parallel is not None:
+        command_arguments += ["--max-parallel", str(params.max_parallel)]
     command_arguments.append(host_config.primary_ip_config.address or host_config.name)
     yield SpecialAgentCommand(command_arguments=command_arguments)
 
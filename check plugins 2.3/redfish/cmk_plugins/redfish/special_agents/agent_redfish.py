@@ -9,7 +9,10 @@
 import json
 import logging
 import sys
+import threading
+import time
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 
 import cmk.utils.password_store
 import redfish
@@ -100,6 +103,35 @@ def parse_arguments(argv: Sequence[str] | None) -> Args:
         type=int,
         help="""Number auf connection retries before failing""",
     )
+    parser.add_argument(
+        "--expand",
+        action="store_true",
+        default=False,
+        help="""Fetch collections with the vendor specific $expand query and
+                use the data view of iLO 5 instead of fetching every member""",
+    )
+    parser.add_argument(
+        "--cache-interval",
+        default=0,
+        type=int,
+        help="""Seconds slow changing resources (System, Chassis, Manager,
+                Processors, Memory, FirmwareInventory, NetworkAdapters) are
+                served from the local cache without asking the management
+                interface (default: 0, always revalidate with the ETag)""",
+    )
+    parser.add_argument(
+        "--disable-cache",
+        action="store_true",
+        default=False,
+        help="""Do not use the local resource cache and conditional requests""",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        default=4,
+        type=int,
+        help="""Maximum number of parallel requests against the management
+                interface (default: 4, 1 disables parallel fetching)""",
+    )
     # required
     parser.add_argument(
         "host",
@@ -122,75 +154,266 @@ def dropnonascii(input_str):
     return output_str
 
 
+class FetchError(Exception):
+    """a data object could not be fetched, the agent run is aborted"""
+
+
+class FetchSettings:
+    """Runtime settings for fetching data from the management interface"""
+
+    max_parallel = 4
+    debug = False
+    expand = False
+    expand_string = ""
+    cache = None
+    # limits the number of requests running at the same time against one BMC
+    limiter = threading.BoundedSemaphore(max_parallel)
+
+    @classmethod
+    def configure(cls, max_parallel, debug, expand):
+        """set parallelism, expand mode and debug output for this agent run"""
+        cls.max_parallel = max(1, max_parallel)
+        cls.debug = debug
+        cls.expand = expand
+        cls.limiter = threading.BoundedSemaphore(cls.max_parallel)
+
+
+class ResourceCache:
+    """On disk cache for slow changing Redfish resources of one host,
+    resources are revalidated with their ETag"""
+
+    static_components = {
+        "System",
+        "Chassis",
+        "Manager",
+        "Processors",
+        "Memory",
+        "FirmwareInventory",
+        "NetworkAdapters",
+    }
+
+    def __init__(self, host, interval):
+        self.store_path = (
+            paths.tmp_dir / "agents" / "agent_redfish" / f"{host}_resources.json"
+        )
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.resources = json.loads(
+            store.load_text_from_file(self.store_path, default="{}")
+        )
+        self.used = set()
+
+    def get(self, url):
+        """cached resource entry of an url"""
+        with self.lock:
+            entry = self.resources.get(url)
+            if entry:
+                self.used.add(url)
+            return entry
+
+    def is_fresh(self, entry):
+        """resource can be used without asking the management interface"""
+        return time.time() - entry.get("timestamp", 0) < self.interval
+
+    def update(self, url, etag, data):
+        """save a fetched or revalidated resource"""
+        with self.lock:
+            self.resources[url] = {
+                "etag": etag,
+                "timestamp": time.time(),
+                "data": data,
+            }
+            self.used.add(url)
+
+    def save(self):
+        """write all resources used in this run to disk"""
+        with self.lock:
+            used_resources = {
+                url: entry for url, entry in self.resources.items() if url in self.used
+            }
+        store.save_text_to_file(self.store_path, json.dumps(used_resources))
+
+
+def debug_timing(component, start_time):
+    """write timing information for a fetched component in debug mode"""
+    if FetchSettings.debug:
+        sys.stderr.write(
+            f"DEBUG: fetching {component} took {time.monotonic() - start_time:.3f}s\n"
+        )
+
+
+def request_data(redfishobj, url, component):
+    """request a data object from Redfish, slow changing resources
+    are taken from the resource cache or requested conditionally"""
+    cache = FetchSettings.cache
+    if not (cache and component in cache.static_components):
+        cache = None
+    entry = None
+    headers = None
+    if cache:
+        entry = cache.get(url)
+        if entry and cache.is_fresh(entry):
+            return 200, entry["data"]
+        if entry and entry.get("etag"):
+            headers = {"If-None-Match": entry["etag"]}
+
+    with FetchSettings.limiter:
+        response_url = redfishobj.get(url, None, headers=headers)
+
+    if entry and response_url.status == 304:
+        cache.update(url, entry.get("etag"), entry["data"])
+        return 200, entry["data"]
+    if response_url.status == 200:
+        if cache:
+            etag = response_url.getheader("ETag") or response_url.dict.get(
+                "@odata.etag"
+            )
+            cache.update(url, etag, response_url.dict)
+        return 200, response_url.dict
+    return response_url.status, None
+
+
 def fetch_data(redfishobj, url, component):
     """fetch a single data object from Redfish"""
-    response_url = redfishobj.get(url, None)
-    if response_url.status == 200:
-        return response_url.dict
+    status, data = request_data(redfishobj, url, component)
+    if status == 200:
+        return data
+    # may run in a worker thread, the main thread logs out and ends the run
+    raise FetchError(component)
 
-    sys.stdout.write(f"{component} data could not be fetched\n")
-    redfishobj.logout()
-    sys.exit(1)
+
+def fetch_expanded(redfishobj, url, component):
+    """fetch a collection with the vendor specific expand query,
+    falls back to the normal query if the expand query is not supported"""
+    if FetchSettings.expand and FetchSettings.expand_string:
+        status, data = request_data(
+            redfishobj, f"{url}{FetchSettings.expand_string}", component
+        )
+        if status == 200:
+            return data
+    return fetch_data(redfishobj, url, component)
+
+
+def fetch_view(redfishobj, vendor_data):
+    """fetch the predefined data view from HPE iLO 5 with one request"""
+    if not (FetchSettings.expand and vendor_data.view_supported):
+        return {}
+    with FetchSettings.limiter:
+        response_url = redfishobj.post("/redfish/v1/Views/", body=vendor_data.view_select)
+    if response_url.status != 200:
+        return {}
+    return {
+        section: members
+        for section, members in response_url.dict.items()
+        if members and isinstance(members, list) and all(map(member_expanded, members))
+    }
+
+
+def run_parallel(function, elements):
+    """run a function for all elements with limited parallelism,
+    results are returned in the order of the given elements"""
+    elements = list(elements)
+    if FetchSettings.max_parallel <= 1 or len(elements) <= 1:
+        return [function(element) for element in elements]
+    with ThreadPoolExecutor(
+        max_workers=min(FetchSettings.max_parallel, len(elements))
+    ) as executor:
+        try:
+            return list(executor.map(function, elements))
+        except Exception:
+            # no new requests after a failure, the running ones are finished
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
+def fetch_data_list(redfishobj, url_list, component):
+    """fetch a list of data objects from Redfish"""
+    return run_parallel(
+        lambda url: fetch_data(redfishobj, url, component),
+        url_list,
+    )
+
+
+def member_expanded(member):
+    """check if a collection member contains data and not only the link"""
+    return isinstance(member, dict) and bool(set(member) - {"@odata.id"})
 
 
 def fetch_collection(redfishobj, data, component):
-    """fetch a whole collection from Redfish data"""
-    member_list = data.get("Members")
-    data_list = []
-    for element in member_list:
-        if element.get("@odata.id"):
-            element_data = fetch_data(redfishobj, element.get("@odata.id"), component)
-            data_list.append(element_data)
-    return data_list
+    """fetch a whole collection from Redfish data,
+    only members not already expanded by the BMC are fetched separately"""
+    member_list = [
+        element for element in data.get("Members", []) if element.get("@odata.id")
+    ]
+    url_list = [
+        element.get("@odata.id")
+        for element in member_list
+        if not member_expanded(element)
+    ]
+    fetched_members = iter(fetch_data_list(redfishobj, url_list, component))
+    return [
+        element if member_expanded(element) else next(fetched_members)
+        for element in member_list
+    ]
 
 
 def fetch_list_of_elements(redfishobj, fetch_elements, sections, data):
     """fetch a list of single elements from Redfish"""
-    result_set = {}
-    for element in fetch_elements:
+
+    def fetch_element(element):
+        start_time = time.monotonic()
         result_list = []
         element_list = []
-        if element not in sections:
-            continue
-        if element not in data.keys():
-            continue
-
         fetch_result = data.get(element)
         if isinstance(fetch_result, dict):
             element_list.append(fetch_result)
         else:
             element_list = fetch_result
-        for entry in element_list:
-            result = fetch_data(redfishobj, entry.get("@odata.id"), element)
-            # debug output of fetching element
-            # sys.stdout.write(f'Fetching {entry.get("@odata.id")}')
+        url_list = [entry.get("@odata.id") for entry in element_list]
+        for result in fetch_data_list(redfishobj, url_list, element):
             if "error" in result.keys():
                 continue
             if "Collection" in result.get("@odata.type", "No Data"):
                 result_list.extend(fetch_collection(redfishobj, result, element))
             else:
                 result_list.append(result)
-        result_set[element] = result_list
-    return result_set
+        debug_timing(element, start_time)
+        return result_list
+
+    elements = [
+        element
+        for element in fetch_elements
+        if element in sections and element in data.keys()
+    ]
+    return dict(zip(elements, run_parallel(fetch_element, elements)))
 
 
 def fetch_sections(redfishobj, fetching_sections, sections, data):
     """fetch a single section of Redfish data"""
-    result_set = {}
-    for section in fetching_sections:
-        if section not in sections:
-            continue
-        if section not in data.keys():
-            continue
-        section_data = fetch_data(
+
+    def fetch_section(section):
+        start_time = time.monotonic()
+        section_data = fetch_expanded(
             redfishobj, data.get(section).get("@odata.id"), section
         )
+        result = None
         if "Collection" in section_data.get("@odata.type"):
             if section_data.get("Members@odata.count", 0) != 0:
                 result = fetch_collection(redfishobj, section_data, section)
-                result_set[section] = result
         else:
-            result_set[section] = section_data
+            result = section_data
+        debug_timing(section, start_time)
+        return result
+
+    fetch_list = [
+        section
+        for section in fetching_sections
+        if section in sections and section in data.keys()
+    ]
+    result_set = {}
+    for section, result in zip(fetch_list, run_parallel(fetch_section, fetch_list)):
+        if result is not None:
+            result_set[section] = result
     return result_set
 
 
@@ -208,14 +431,14 @@ def fetch_hpe_smartstorage(redfishobj, link_list, sections):
             "LogicalDrives",
             "PhysicalDrives",
         ]
-        resulting_sections = list(set(storage_sections).intersection(sections))
+        resulting_sections = sorted(set(storage_sections).intersection(sections))
         cntrl_result = fetch_sections(
             redfishobj, resulting_sections, sections, storage_links
         )
         process_result(cntrl_result)
         for element in cntrl_result.get("ArrayControllers", []):
             contrl_links = element.get("Links", {})
-            resulting_sections = list(set(controller_sections).intersection(sections))
+            resulting_sections = sorted(set(controller_sections).intersection(sections))
             result = fetch_sections(
                 redfishobj, resulting_sections, sections, contrl_links
             )
@@ -288,20 +511,6 @@ class VendorHPEData(VendorGeneric):
                 "From": f"/Systems/1/EthernetInterfaces/{expand_string}",
                 "Properties": ["Members AS EthernetInterfaces"],
             },
-            {
-                "From": f"/Systems/1/BaseNetworkAdapters/{expand_string}",
-                "Properties": ["Members AS NetworkAdapters"],
-            },
-            {
-                "From": f"/Chassis/1/Power/{expand_string}",
-                "Properties": ["PowerSupplies", "Redundancy AS PowerRedundancy"],
-            },
-            {"From": "/Chassis/1/Thermal/", "Properties": ["Temperatures", "Fans"]},
-            {"From": f"/Managers/{expand_string}", "Properties": ["Members as ILO"]},
-            {
-                "From": f"/Managers/1/EthernetInterfaces/{expand_string}",
-                "Properties": ["Members as ILOInterfaces"],
-            },
         ]
     }
     view_response = None
@@ -429,6 +638,7 @@ def get_information(redfishobj, sections):
     base_data = fetch_data(redfishobj, "/redfish/v1", "Base")
 
     vendor_data = detect_vendor(base_data)
+    FetchSettings.expand_string = vendor_data.expand_string
 
     manager_url = base_data.get("Managers", {}).get("@odata.id")
     chassis_url = base_data.get("Chassis", {}).get("@odata.id")
@@ -439,7 +649,7 @@ def get_information(redfishobj, sections):
 
     # fetch managers
     if manager_url:
-        manager_col = fetch_data(redfishobj, manager_url, "Manager")
+        manager_col = fetch_expanded(redfishobj, manager_url, "Manager")
         manager_data = fetch_collection(redfishobj, manager_col, "Manager")
 
         for element in manager_data:
@@ -454,7 +664,7 @@ def get_information(redfishobj, sections):
         w.append(f"AgentOS: {vendor_data.version} - {vendor_data.firmware_version}")
 
     # fetch systems
-    systems_col = fetch_data(redfishobj, systems_url, "System")
+    systems_col = fetch_expanded(redfishobj, systems_url, "System")
     systems_data = fetch_collection(redfishobj, systems_col, "System")
 
     if data_model in ["Hpe", "Hp"]:
@@ -467,7 +677,7 @@ def get_information(redfishobj, sections):
                 .keys()
             )
             data_model_links.extend(system_oem_links)
-        extra_links = list(set(data_model_links).intersection(sections))
+        extra_links = sorted(set(data_model_links).intersection(sections))
     else:
         extra_links = []
 
@@ -478,7 +688,7 @@ def get_information(redfishobj, sections):
     with SectionWriter("redfish_system") as w:
         w.append_json(systems_data)
 
-    systems_sections = list(
+    systems_sections = sorted(
         set(
             [
                 "EthernetInterfaces",
@@ -494,7 +704,18 @@ def get_information(redfishobj, sections):
         "Volumes",
     ]
 
-    resulting_sections = list(set(systems_sections).intersection(sections))
+    resulting_sections = sorted(set(systems_sections).intersection(sections))
+    # the iLO 5 view is only valid for servers with exactly one system
+    if len(systems_data) == 1:
+        view_result = {
+            section: members
+            for section, members in fetch_view(redfishobj, vendor_data).items()
+            if section in resulting_sections
+        }
+        process_result(view_result)
+        resulting_sections = [
+            section for section in resulting_sections if section not in view_result
+        ]
     for system in systems_data:
         if data_model in ["Hpe", "Hp"] and "SmartStorage" in resulting_sections:
             if vendor_data.firmware_version.startswith("3."):
@@ -525,7 +746,7 @@ def get_information(redfishobj, sections):
             fetch_extra_data(redfishobj, data_model, extra_links, sections, system)
 
     # fetch chassis
-    chassis_col = fetch_data(redfishobj, chassis_url, "Chassis")
+    chassis_col = fetch_expanded(redfishobj, chassis_url, "Chassis")
     chassis_data = fetch_collection(redfishobj, chassis_col, "Chassis")
     with SectionWriter("redfish_chassis") as w:
         w.append_json(chassis_data)
@@ -535,7 +756,7 @@ def get_information(redfishobj, sections):
         "Thermal",
         "Sensors",
     ]
-    resulting_sections = list(set(chassis_sections).intersection(sections))
+    resulting_sections = sorted(set(chassis_sections).intersection(sections))
     for chassis in chassis_data:
         result = fetch_sections(redfishobj, resulting_sections, sections, chassis)
         process_result(result)
@@ -617,9 +838,21 @@ def agent_redfish_main(args: Args) -> int:
         logger = redfish.redfish_logger(logger_file, logger_format, logging.INFO)
         logger.info("Redfish API")
 
+    FetchSettings.configure(args.max_parallel, args.debug, args.expand)
+    if not args.disable_cache:
+        FetchSettings.cache = ResourceCache(args.host, args.cache_interval)
+
     # Start Redfish Session Object
     redfishobj = get_session(args)
-    get_information(redfishobj, args.sections)
+    try:
+        get_information(redfishobj, args.sections)
+    except FetchError as excp:
+        # all workers have finished here, the session is closed only once
+        sys.stdout.write(f"{excp} data could not be fetched\n")
+        redfishobj.logout()
+        return 1
+    if FetchSettings.cache:
+        FetchSettings.cache.save()
     # logout not needed anymore if no problem - session saved to file
     # logout is done if some query fails
     # REDFISHOBJ.logout()
@@ -35,6 +35,17 @@ register_rule(group,
                             "file for the user your monitoring is running under (on OMD: the site user)"
                    ))
             ),
+            ( "multiplex",
+               Checkbox(
+                   title = _("Use a single SSH connection"),
+                   label = _("Run all commands over one persistent SSH connection"),
+                   default_value = False,
+                   help = _("Opens one SSH connection (OpenSSH ControlMaster) and runs all "
+                            "show commands over it. The connection is kept open for three "
+                            "minutes and reused by the following agent calls. This avoids "
+                            "the slow login on the storage system for every command."
+                   ))
+            ),
             ( "infos",
               Transform(
                   ListChoice(
@@ -45,6 +56,10 @@ register_rule(group,
                          ( "showvv",          _("MDisksGrps") ),
                          ( "showps",          _("IO Groups") ),
                          ( "shownode",        _("Node Stats") ),
+                         ( "statvv",          _("VV performance (statvv)") ),
+                         ( "statport",        _("Port performance (statport)") ),
+                         ( "statpd",          _("Disk performance (statpd)") ),
+                         ( "statcpu",         _("Node CPU utilization (statcpu)") ),
                      ],
                      default_value = [ "showcage", "showpd", "showld", "showvv", "showps",
                                        "shownode" ],
@@ -54,7 +69,7 @@ register_rule(group,
                 )
              ),
         ],
-        optional_keys = [ ],
+        optional_keys = [ "multiplex" ],
     ),
     factory_default = FACTORY_DEFAULT_UNUSED, # No default, do not use setting if no rule matches
     match = 'first')
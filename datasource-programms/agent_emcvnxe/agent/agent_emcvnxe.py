@@ -32,7 +32,8 @@
 # without user and password
 #uemcli.sh -silent -d 10.1.36.13 show </env/disk> -output csv
 
-import sys, os, getopt, re, subprocess
+import sys, os, getopt, re, signal, subprocess, threading, time
+from multiprocessing.pool import ThreadPool
 
 import inspect, pprint # FOR DEBUGGING
 
@@ -63,6 +64,11 @@ OPTIONS:
 
   --profile                     Enable performance profiling in Python source code
 
+  -t SECS, --timeout SECS       Kill a single CLI command after SECS seconds (default 60)
+
+  --max-parallel N              Execute up to N CLI commands at the same time (default 1).
+                                The output is buffered and written in the usual order.
+
   -i MODULES, --modules MODULES Modules to query. This is a comma separated list of
                                 which may contain the keywords "ssd", "ps", "iomodule",
                                 "dae", "lcc" or "all" to define which information
@@ -75,7 +81,7 @@ OPTIONS:
 # command line options
 #############################################################################
 short_options = 'hu:p:t:m:'
-long_options  = [ 'help', 'user=', 'password=', 'debug', 'timeout=', 'modules=' ]
+long_options  = [ 'help', 'user=', 'password=', 'debug', 'timeout=', 'modules=', 'max-parallel=' ]
 
 try:
     opts, args = getopt.getopt(sys.argv[1:], short_options, long_options)
@@ -85,6 +91,7 @@ except getopt.GetoptError, err:
 
 opt_debug      = False
 opt_timeout    = 60
+opt_max_parallel = 1
 
 host_address   = None
 user           = None
@@ -117,6 +124,8 @@ for o,a in opts:
         mortypes = a.split(',')
     elif o in [ '-t', '--timeout' ]:
         opt_timeout = int(a)
+    elif o in [ '--max-parallel' ]:
+        opt_max_parallel = int(a)
     elif o in [ '-h', '--help' ]:
         usage()
         sys.exit(0)
@@ -151,6 +160,49 @@ try:
 except ValueError:
     pass
 
+#############################################################################
+def kill_command(proc):
+#############################################################################
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass # already finished
+
+#############################################################################
+def run_command(cmd):
+#############################################################################
+    # Runs cmd in its own process group, so that a hanging CLI (the shell and
+    # its java process) can be killed after opt_timeout seconds
+    if opt_debug:
+        sys.stderr.write("executing external command: %s\n" % cmd)
+    start = time.time()
+    proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, preexec_fn=os.setsid)
+    timer = threading.Timer(opt_timeout, kill_command, [proc])
+    timer.start()
+    try:
+        output = proc.communicate()[0]
+    finally:
+        timer.cancel()
+    if proc.returncode == -signal.SIGKILL:
+        sys.stderr.write("Command timed out after %d seconds: %s\n" % (opt_timeout, cmd))
+    if opt_debug:
+        sys.stderr.write("command took %.2fs: %s\n" % (time.time() - start, cmd))
+    return output.splitlines(True)
+
+#############################################################################
+def run_commands(commands):
+#############################################################################
+    # Returns the output of all commands in the given order. With --max-parallel
+    # up to opt_max_parallel commands are executed at the same time
+    if opt_max_parallel <= 1 or len(commands) <= 1:
+        return map(run_command, commands)
+    pool = ThreadPool(min(opt_max_parallel, len(commands)))
+    try:
+        return pool.map(run_command, commands)
+    finally:
+        pool.close()
+        pool.join()
+
 #############################################################################
 # fetch information by calling uemcli
 #############################################################################
@@ -165,12 +217,9 @@ else:
 # check_mk section of agent output
 #
 
-cmd = basecmd + "/sys/general show -output csv"
-if opt_debug:
-    sys.stderr.write("executing external command: %s\n" % cmd)
-
-# Now read the whole output of the command
-cmdout = [ l.strip() for l in os.popen(cmd + " 2>&1").readlines() ]
+# The general information is fetched first, a missing uemcli or missing
+# credentials abort the agent before any module command is started
+cmdout = [ l.strip() for l in run_command(basecmd + "/sys/general show -output csv 2>&1") ]
 
 if cmdout:
     if "uemcli.sh: not found" in cmdout[0]:
@@ -182,6 +231,14 @@ if cmdout:
                          "credentials if you don't have a security file.\n")
         sys.exit(1)
 
+# The module commands are independent of each other
+modules = [ module for module in naviseccli_options.keys()
+            if naviseccli_options[module]["active"] == True ]
+commands = [ basecmd + naviseccli_options[module]["cmd_option"] + " show -output csv"
+             for module in modules ]
+
+outputs = run_commands(commands)
+
 # Try to gather the version of the agent
 emcvnxe_version = None
 for line in cmdout:
@@ -202,16 +259,12 @@ print "<<<emcvnxe_info:sep(44)>>>"
 for line in cmdout:
     print line
 
-for module in naviseccli_options.keys():
-    if naviseccli_options[module]["active"] == True:
-        separator = naviseccli_options[module]["sep"]
-        if separator:
-            print "<<<emcvnxe_%s:sep(%s)>>>" % (module, separator)
-        else:
-            print "<<<emcvnxe_%s>>>" % module
-        cmd=basecmd + naviseccli_options[module]["cmd_option"] + " show -output csv"
-        if opt_debug:
-            sys.stderr.write("executing external command: %s\n" % cmd)
-        for line in os.popen(cmd).readlines():
-            print line,
+for module, output in zip(modules, outputs):
+    separator = naviseccli_options[module]["sep"]
+    if separator:
+        print "<<<emcvnxe_%s:sep(%s)>>>" % (module, separator)
+    else:
+        print "<<<emcvnxe_%s>>>" % module
+    for line in output:
+        print line,
 
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Replaces the built-in "special_agents:netapp" rule. The parameters of the
+# built-in rule are kept, so existing rules stay valid.
+
+group = "datasource_programs"
+
+register_rule(group,
+    "special_agents:netapp",
+     Dictionary(
+        title = _("Check NetApp via WebAPI"),
+        help = _("This rule set selects the NetApp special agent instead of the normal Check_MK Agent "
+                 "and allows monitoring via the NetApp API. Please note: the configured user requires "
+                 "the permissions listed in <tt>agent_netapp --help</tt>."),
+        elements = [
+            ( "username",
+              TextAscii(
+                  title = _("Username"),
+                  allow_empty = False,
+              )
+            ),
+            ( "password",
+              Password(
+                  title = _("Password"),
+                  allow_empty = False,
+              )
+            ),
+            ( "skip_elements",
+              ListChoice(
+                  title = _("Performance data"),
+                  choices = [
+                      ( "volumes", _("Do not query volume performance counters") ),
+                  ],
+                  help = _("Here you can configure whether the performance counters should get queried. "
+                           "This can save quite a lot of CPU load on larger systems."),
+                  default_value = [],
+              )
+            ),
+            ( "counters",
+              ListOf(
+                  Tuple(
+                      orientation = "horizontal",
+                      elements = [
+                          TextAscii(
+                              title = _("Performance object"),
+                              allow_empty = False,
+                          ),
+                          ListOfStrings(
+                              title = _("Counters"),
+                              orientation = "horizontal",
+                              help = _("Leave empty to query all counters of the object."),
+                          ),
+                      ],
+                  ),
+                  title = _("Performance counters per object"),
+                  help = _("By default the agent only queries the counters used by the checks for the "
+                           "objects <tt>volume</tt>, <tt>lif</tt> and <tt>ifnet</tt>, all other objects "
+                           "are queried with all their counters. Here you can replace the counters "
+                           "queried for an object. Every counter less reduces the size of the "
+                           "answers and the load on the filer."),
+                  add_label = _("Add object"),
+              )
+            ),
+        ],
+        optional_keys = [ "skip_elements", "counters" ],
+    ),
+    factory_default = FACTORY_DEFAULT_UNUSED, # No default, do not use setting if no rule matches
+    match = 'first')
@@ -1,10 +1,13 @@
 #!/usr/bin/python
 
-import pexpect, sys, cmd, time, os, getopt
+import pexpect, sys, cmd, time, os, getopt, hashlib
+from multiprocessing.pool import ThreadPool
+from StringIO import StringIO
 
 def usage():
-    sys.stderr.write("""Check_MK 3par Agent
-USAGE: config_backup.py HOST
+    sys.stderr.write("""Cisco Switch Config Backup
+USAGE: config_backup.py [OPTIONS] HOST [HOST ...]
+       config_backup.py [OPTIONS] -f HOSTLIST
        config_backup -h
 
 ARGUMENTS:
@@ -12,12 +15,24 @@ ARGUMENTS:
 
 OPTIONS:
   -h, --help                                Show this help message and exit
+  -f FILE, --hostlist=FILE                  File with one host per line, lines
+                                            starting with # are ignored
+  -p N, --max-parallel=N                    Number of concurrent SSH sessions
+                                            (default 10)
+
+The running configuration of every host is only written if it differs from
+the stored one. All changed configurations are committed together in one
+GIT commit with a summary of all devices.
 """)
 
-opt_host = None
+opt_hosts = []
+opt_hostlist = None
+opt_max_parallel = 10
 
-short_options = "hh:"
-long_options = [ "help" ]
+backup_dir = "/backup"
+
+short_options = "hf:p:"
+long_options = [ "help", "hostlist=", "max-parallel=" ]
 
 try:
     opts, args = getopt.getopt( sys.argv[1:], short_options, long_options )
@@ -29,22 +44,28 @@ for opt, arg in opts:
         if opt in ['-h', '--help']:
             usage()
             sys.exit(0)
+        elif opt in ['-f', '--hostlist']:
+            opt_hostlist = arg
+        elif opt in ['-p', '--max-parallel']:
+            opt_max_parallel = max(1, int(arg))
         elif not opt:
             usage()
             sys.exit(0)
 
-if len(args) == 1:
-    opt_host = args[0]
-elif not args:
+opt_hosts = list(args)
+if opt_hostlist:
+    for line in file(opt_hostlist):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            opt_hosts.append(line)
+
+if not opt_hosts:
     sys.stderr.write("ERROR: No host given.\n")
     sys.exit(1)
-else:
-    sys.stderr.write("ERROR: Please specify exactly one host.\n")
-    sys.exit(1)
 
 def git_command(args):
     encoded_args = " ".join([ a.encode("utf-8") for a in args ])
-    command = "cd '%s' && git %s 2>&1" % ("/backup", encoded_args)
+    command = "cd '%s' && git %s 2>&1" % (backup_dir, encoded_args)
     p = os.popen(command)
     output = p.read()
     status = p.close()
@@ -54,40 +75,95 @@ def git_command(args):
 def shell_quote(s):
     return "'" + s.replace("'", "'\"'\"'") + "'"
 
-def do_git_commit():
+def do_git_commit(files, message):
     author = shell_quote("%s <%s>" % ("OMD site sandvik", "sandvik@DEWRMON01.Schmalkalden@sandvik.com"))
-    git_dir = "/backup/.git"
+    git_dir = backup_dir + "/.git"
     if not os.path.exists(git_dir):
         git_command(["init"])
-        file("/backup/.gitignore", "w").write("!.gitignore\n*swp\n")
+        file(backup_dir + "/.gitignore", "w").write("!.gitignore\n*swp\n")
 
         git_command(["add", ".gitignore" ])
-        git_command(["commit", "--author", author, "-m", shell_quote(_("Initialized GIT for Backup"))])
+        git_command(["commit", "--author", author, "-m", shell_quote("Initialized GIT for Backup")])
 
     # Only commit, if something is changed
-    if os.popen("cd '%s' && git ls-files -om" % "/backup").read().strip():
-        git_command(["add", "*"])
-        message = "New configuration added"
+    if files:
+        git_command(["add"] + [ shell_quote(f) for f in files ])
         git_command(["commit", "--author", author, "-m", shell_quote(message)])
 
 user = '<user>'
 password = '<password>'
 
-child = pexpect.spawn ('ssh '+user+'@'+opt_host)
-child.maxread=9999999
-child.expect ('.*assword:.*')
-child.sendline (password)
-child.expect ('.*#')
-child.sendline ('terminal length 0')
-child.expect ('.*#')
-fout = file('/backup/'+host+'-running-config.bak','w')
-child.logfile_read = fout
-child.sendline('show running-config')
-child.expect('.*#', timeout=999)
-fout.close()
-child.sendline('exit')
-child.close()
-do_git_commit()
-
-sys.stdout.write("Configuration succesfull saved")
-sys.exit(0)
\ No newline at end of file
+# Lines which change without a change of the configuration
+volatile_lines = ("ntp clock-period", "Current configuration :")
+
+def config_hash(config):
+    lines = [ line for line in config.splitlines() if not line.strip().startswith(volatile_lines) ]
+    return hashlib.sha256("\n".join(lines)).hexdigest()
+
+def backup_filename(host):
+    return host + '-running-config.bak'
+
+def fetch_running_config(host):
+    child = pexpect.spawn ('ssh '+user+'@'+host)
+    child.maxread=9999999
+    try:
+        child.expect ('.*assword:.*')
+        child.sendline (password)
+        child.expect ('.*#')
+        child.sendline ('terminal length 0')
+        child.expect ('.*#')
+        fout = StringIO()
+        child.logfile_read = fout
+        child.sendline('show running-config')
+        child.expect('.*#', timeout=999)
+        child.logfile_read = None
+        child.sendline('exit')
+    finally:
+        child.close()
+    return fout.getvalue()
+
+def backup_host(host):
+    """Returns the host, the state of the backup (changed, unchanged, new
+    or failed) and an error text"""
+    try:
+        config = fetch_running_config(host)
+    except Exception, e:
+        return host, "failed", str(e)
+
+    path = os.path.join(backup_dir, backup_filename(host))
+    if os.path.exists(path):
+        if config_hash(file(path).read()) == config_hash(config):
+            return host, "unchanged", ""
+        state = "changed"
+    else:
+        state = "new"
+    file(path, 'w').write(config)
+    return host, state, ""
+
+pool = ThreadPool(min(opt_max_parallel, len(opt_hosts)))
+results = pool.map(backup_host, opt_hosts)
+pool.close()
+pool.join()
+
+summary = []
+changed_files = []
+failed = 0
+for host, state, error in results:
+    if state in [ "changed", "new" ]:
+        changed_files.append(backup_filename(host))
+    if state == "failed":
+        failed += 1
+        summary.append("%s: %s (%s)" % (host, state, error))
+    else:
+        summary.append("%s: %s" % (host, state))
+
+message = "New configuration of %d of %d devices\n\n%s" % (len(changed_files), len(opt_hosts), "\n".join(summary))
+do_git_commit(changed_files, message)
+
+sys.stdout.write("\n".join(summary) + "\n")
+if failed:
+    sys.stdout.write("Backup of %d devices failed\n" % failed)
+    sys.exit(1)
+
+sys.stdout.write("Configuration succesfull saved\n")
+sys.exit(0)
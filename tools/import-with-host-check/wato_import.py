@@ -36,25 +36,39 @@ testing = False
 import os
 import sys
 import socket
+import time
 
 socket_pathlokal = "~/tmp/run/live"
 socket_path = os.path.expanduser(socket_pathlokal)
 
-s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-s.connect(socket_path)
 
-# Write command to socket
-s.send("GET hosts\nColumns: host_name address\n")
+def read_existing_hosts(path):
+    """Reads host names and addresses from livestatus in chunks and returns
+    a dict name -> address, the answer is never held completely in memory"""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.connect(path)
 
-# Important: Close sending direction. That way
-# the other side knows we are finished.
-s.shutdown(socket.SHUT_WR)
+    # Write command to socket
+    s.send("GET hosts\nColumns: host_name address\n")
 
-# Now read the answer
-answer = s.recv(100000000)
+    # Important: Close sending direction. That way
+    # the other side knows we are finished.
+    s.shutdown(socket.SHUT_WR)
+
+    hosts = {}
+    rest = ""
+    while True:
+        chunk = s.recv(65536)
+        if not chunk:
+            break
+        lines = (rest + chunk).split('\n')
+        rest = lines.pop()
+        for line in lines:
+            name, address = (line.split(';', 1) + [''])[:2]
+            hosts[name] = address
+    s.close()
+    return hosts
 
-# Parse the answer into a table (a list of lists)
-table = [ line.split(';') for line in answer.split('\n')[:-1] ]
 
 # tag mappings
 # these correspond to host tags define in WATO
@@ -90,58 +104,74 @@ tagz = {
 
 }
 
+dry_run = "--dry-run" in sys.argv[1:]
+skip_addresses = "--skip-existing-addresses" in sys.argv[1:]
+arguments = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
 try:
     pathlokal = "~/etc/check_mk/conf.d/wato/"
     pathlokal = os.path.expanduser(pathlokal)
-    datei = open(sys.argv[1],'r')
+    datei = open(arguments[0],'r')
 except:
     print """Run this script inside a OMD site
-    Usage: ./wato_import.py csvfile.csv
+    Usage: ./wato_import.py [--dry-run] [--skip-existing-addresses] csvfile.csv
+    --dry-run                  only report what would be imported and the timing
+    --skip-existing-addresses  also skip hosts whose IP address is already monitored
     CSV Example:
     wato_foldername;hostname;host_alias;parents;ip_address;tags"""
     sys.exit()
 
+timing = {}
+start_time = time.time()
+existing_hosts = read_existing_hosts(socket_path)
+existing_addresses = set(existing_hosts.values())
+livestatus_hosts = len(existing_hosts)
+timing["livestatus"] = time.time() - start_time
+
+# The CSV is processed in one pass, existence is checked against the index
+start_time = time.time()
 errorz = 0
+counts = {"lines": 0, "existing": 0, "existing_address": 0, "imported": 0}
 folders = {}
 for line in datei:
-    nameexist = False
+    counts["lines"] += 1
     line=line.replace('\n',';\n')
     ordner, name, alias, parents, ip, tags = line.split(';')[:6]
-    if testing == False:
-        if ordner:
-          try:
-            os.makedirs(pathlokal+ordner)
-          except os.error:
-            pass
     folders.setdefault(ordner,[])
-    for i in table:
-        if i[0] == name:
-            nameexist = True
-    if nameexist == False:
-        folders[ordner].append((name,alias,parents,ip,tags))
+    if name in existing_hosts:
+        counts["existing"] += 1
+        continue
+    if skip_addresses and ip in existing_addresses:
+        print ("host '%s' skipped, address %s is already monitored" % (name, ip))
+        counts["existing_address"] += 1
+        continue
+    existing_hosts[name] = ip
+    existing_addresses.add(ip)
+    folders[ordner].append((name,alias,parents,ip,tags))
+    counts["imported"] += 1
 datei.close()
 
+folder_configs = {}
 for folder in folders:
-    all_hosts = ""
-    host_attributes = ""
-    ip_addresses = ""
-    alias_details = ""
-    parent_details = ""
+    all_hosts = []
+    host_attributes = []
+    ip_addresses = []
+    alias_details = []
+    parent_details = []
     for name, alias, parents, ip, tags in folders[folder]:
-#      print tags
       tags2 = tags.replace('|\n','')
-      all_hosts += "  '%s|%s',\n" % (name, tags2)
-      ip_addresses += "  '%s': u'%s',\n" % (name, ip)
-      alias_details += "  (u'%s', ['%s']),\n" % (alias, name)
+      all_hosts.append("  '%s|%s',\n" % (name, tags2))
+      ip_addresses.append("  '%s': u'%s',\n" % (name, ip))
+      alias_details.append("  (u'%s', ['%s']),\n" % (alias, name))
       if parents != '':
-          parent_details += "  ('%s', ['%s']),\n" % (parents, name)
+          parent_details.append("  ('%s', ['%s']),\n" % (parents, name))
 
-      host_attributes += "  '%s': {\n" % (name)
-      host_attributes += "    'alias': u'%s',\n" % (alias)
-      host_attributes += "    'ipaddress': u'%s',\n" % (ip)
+      attributes = ["  '%s': {\n" % (name)]
+      attributes.append("    'alias': u'%s',\n" % (alias))
+      attributes.append("    'ipaddress': u'%s',\n" % (ip))
       if parents != '':
           parents2 = parents.replace(",","', '")
-          host_attributes += "    'parents': ['%s'],\n" % (parents2)
+          attributes.append("    'parents': ['%s'],\n" % (parents2))
 
       # handle tags
 
@@ -150,66 +180,60 @@ for folder in folders:
         if tagz.has_key(word):
           tg = tagz[word]
           if tg != "":
-            host_attributes += "    'tag_%s': '%s',\n" % (tg, word)
+            attributes.append("    'tag_%s': '%s',\n" % (tg, word))
         else:
           if word != "":
               print ("host '%s' has unrecognised tag '%s'" % (name,word))
               errorz += 1
-      host_attributes = host_attributes[:-2] + "},\n"
-
-    if errorz != 0:
-      print "Error(s) detected - aborting"
-      sys.exit()
-
+      host_attributes.append("".join(attributes)[:-2] + "},\n")
+
+    folder_configs[folder] = "".join([
+        'all_hosts += [',
+        "".join(all_hosts),
+        ']\n\n',
+        '# Explicit IP addresses\nipaddresses.update({',
+        "".join(ip_addresses)[:-2],
+        '})\n\n',
+        "# Settings for alias\nextra_host_conf.setdefault('alias', []).extend([",
+        "".join(alias_details)[:-2],
+        '])\n\n',
+        "# Settings for parents\nextra_host_conf.setdefault('parents', []).extend([",
+        "".join(parent_details)[:-2],
+        '])\n\n',
+        'host_attributes.update({',
+        "".join(host_attributes)[:-2],
+        '})\n',
+    ])
+timing["csv"] = time.time() - start_time
+
+# Nothing is written if any host has an unknown tag
+if errorz != 0:
+  print "Error(s) detected - aborting"
+  sys.exit()
+
+start_time = time.time()
+for folder, config in folder_configs.items():
+    if dry_run:
+        continue
     if testing:
         print ('##########################################\n\n# Folder: %s\n\n') % folder
-
-        print ('all_hosts += [')
-        print (all_hosts)
-        print (']\n\n')
-
-        print('# Explicit IP addresses\nipaddresses.update({')
-        # {'test': u'127.0.0.1'}
-        print (ip_addresses[:-2])
-        print ('})\n\n')
-
-        print ("# Settings for alias\nextra_host_conf.setdefault('alias', []).extend([")
-        # (u'test', ['test')]
-        print (alias_details[:-2])
-        print ('])\n\n')
-
-        print ("# Settings for parents\nextra_host_conf.setdefault('parents', []).extend([")
-        # ('test_parent', ['test'])
-        print (parent_details[:-2])
-        print ('])\n\n')
-
-        print ('host_attributes.update({')
-        print (host_attributes[:-2])
-        print ('})\n')
+        print (config)
     else:
+        if folder:
+          try:
+            os.makedirs(pathlokal+folder)
+          except os.error:
+            pass
+        # every folder file is written with a single write
         ziel = open(pathlokal + folder + '/hosts.mk','a')
-
-        ziel.write('all_hosts += [')
-        ziel.write(all_hosts)
-        ziel.write(']\n\n')
-
-        ziel.write('# Explicit IP addresses\nipaddresses.update({')
-        # {'test': u'127.0.0.1'}
-        ziel.write(ip_addresses[:-2])
-        ziel.write('})\n\n')
-
-        ziel.write("# Settings for alias\nextra_host_conf.setdefault('alias', []).extend([")
-        # (u'test', ['test')]
-        ziel.write(alias_details[:-2])
-        ziel.write('])\n\n')
-
-        ziel.write("# Settings for parents\nextra_host_conf.setdefault('parents', []).extend([")
-        # ('test_parent', ['test'])
-        ziel.write(parent_details[:-2])
-        ziel.write('])\n\n')
-
-        ziel.write('host_attributes.update({')
-        ziel.write(host_attributes[:-2])
-        ziel.write('})\n')
-
+        ziel.write(config)
         ziel.close()
+timing["write"] = time.time() - start_time
+
+if dry_run:
+    print ("Dry run, nothing written")
+    print ("Existing hosts in livestatus: %d" % livestatus_hosts)
+    print ("CSV lines: %(lines)d, already existing: %(existing)d, "
+           "existing address: %(existing_address)d, to import: %(imported)d" % counts)
+    print ("Folders: %d" % len(folder_configs))
+    print ("Time livestatus: %(livestatus).3fs, CSV: %(csv).3fs" % timing)
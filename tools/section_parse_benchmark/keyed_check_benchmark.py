@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+"""Time inventory and check of all items of the legacy 3par, EVA and printer
+checks on a synthetic agent output.
+
+The checks with their keyed parse functions are compared with the check code
+before the parse functions, as it is in the commit BASELINE. That code is
+read with git show, the benchmark has to run in a git checkout.
+
+USAGE: keyed_check_benchmark.py [-n ROUNDS] [-o OBJECTS] [-b BASELINE]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import timeit
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+# Last commit with the checks scanning the whole section for every item
+BASELINE = "ff4d366"
+
+CHECKS = {
+    "3par_vv": "datasource-programms/agent_3par/checks/3par_vv",
+    "3par_pd": "datasource-programms/agent_3par/checks/3par_pd",
+    "3par_ld": "datasource-programms/agent_3par/checks/3par_ld",
+    "3par_cage": "datasource-programms/agent_3par/checks/3par_cage",
+    "eva_host_port_statistics": "checks/eva_checks/checks/eva_host_port_statistics",
+    "win_printers": "checks/win_printers/win_printers",
+}
+
+
+def saveint(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def check_temperature(reading, params, unique_name):
+    return 0, "%.1f °C" % reading, [("temp", reading)]
+
+
+def read_current(path):
+    with open(os.path.join(REPO, path), encoding="utf-8") as check_file:
+        return check_file.read()
+
+
+def read_baseline(path, baseline):
+    return subprocess.check_output(
+        ["git", "-C", REPO, "show", "%s:%s" % (baseline, path)]).decode("utf-8")
+
+
+def load_check(source, path):
+    """Returns the check_info of the source of a legacy check file"""
+    context = {
+        "check_info": {},
+        "re": re,
+        "saveint": saveint,
+        "check_temperature": check_temperature,
+        "eva_physical_disk_default_levels": (100, 150),
+    }
+    exec(compile(source, path, "exec"), context)  # pylint: disable=exec-used
+    return context["check_info"]
+
+
+# Synthetic sections, one line per object. The EVA has two controllers with
+# two ports each, its lines are samples of these four items.
+def section_3par_vv(count):
+    return [[str(i), "VV_%05d" % i, "tpvv", "base", "---", str(i), "RW", "normal",
+             "384", "8704", "41216", "102400"] for i in range(count)]
+
+
+def section_3par_pd(count):
+    return [[str(i), "%d:%d:0" % (i // 24, i % 24), "FC", "10", "normal", "838656",
+             "327680", "1:0:1*", "0:0:1", "900"] for i in range(count)]
+
+
+def section_3par_ld(count):
+    return [[str(i), "ld_%05d" % i, "1", "normal", "0/1", "5120", "5120", "V", "0",
+             "---", "N", "Y"] for i in range(count)]
+
+
+def section_3par_cage(count):
+    return [[str(i), "cage%d" % i, "0:0:1", "0", "1:0:1", "0", "24", "25-28", "320c",
+             "320c", "DCN1", "n/a"] for i in range(count)]
+
+
+def section_eva_host_port_statistics(count):
+    return [["FP%d" % (i % 2 + 1), "3", "0.06", "0.1", "41", "0.15", "0.1", "0",
+             "5001-4380-1137-%04X" % i, ("S071", "U010")[i // 2 % 2],
+             "5001-4380-1137-ECF0"]
+            for i in range(count)]
+
+
+def section_win_printers(count):
+    return [["Printer", "Floor", str(i), "0", "3", "2"] for i in range(count)]
+
+
+SECTIONS = {
+    "3par_vv": section_3par_vv,
+    "3par_pd": section_3par_pd,
+    "3par_ld": section_3par_ld,
+    "3par_cage": section_3par_cage,
+    "eva_host_port_statistics": section_eva_host_port_statistics,
+    "win_printers": section_win_printers,
+}
+
+
+# The parameters of the checks which use them
+PARAMS = {
+    "eva_host_port_statistics": (250, 300),
+    "win_printers": (None, None),
+}
+
+
+def baseline_functions(name, check):
+    """inventory and check function of a baseline check. Old style checks are
+    tuples, their inventory function gets the check name as first argument"""
+    if isinstance(check, tuple):
+        check_function, _description, _perfdata, inventory_function = check
+        return lambda info: inventory_function(name, info), check_function
+    return check["inventory_function"], check["check_function"]
+
+
+def items_of(inventory):
+    # An item discovered on several lines is one service, as in Checkmk
+    return list(dict.fromkeys(entry[0] for entry in inventory))
+
+
+def run_keyed(info, check, params):
+    parsed = check["parse_function"](info)
+    for item in items_of(check["inventory_function"](parsed)):
+        result = check["check_function"](item, params, parsed)
+        if hasattr(result, "__next__"):
+            list(result)
+
+
+def run_baseline(info, inventory_function, check_function, params):
+    for item in items_of(inventory_function(info)):
+        check_function(item, params, info)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--rounds", type=int, default=3,
+                        help="Number of runs per check, the fastest one is reported")
+    parser.add_argument("-o", "--objects", type=int, default=5000,
+                        help="Number of lines in the synthetic section")
+    parser.add_argument("-b", "--baseline", default=BASELINE,
+                        help="Commit with the check code to compare with (default %s)" % BASELINE)
+    args = parser.parse_args(argv)
+
+    print("%-28s %8s %8s %12s %12s %8s" %
+          ("Check", "Lines", "Items", "Baseline", "Keyed", "Factor"))
+    for name, make_section in SECTIONS.items():
+        path = CHECKS[name]
+        check = load_check(read_current(path), path)[name]
+        inventory_function, check_function = baseline_functions(
+            name, load_check(read_baseline(path, args.baseline), path)[name])
+        info = make_section(args.objects)
+        params = PARAMS.get(name)
+
+        items = items_of(check["inventory_function"](check["parse_function"](info)))
+        if sorted(items) != sorted(items_of(inventory_function(info))):
+            sys.stderr.write("%s: the baseline discovers other items\n" % name)
+
+        baseline_time = min(timeit.repeat(
+            lambda: run_baseline(info, inventory_function, check_function, params),
+            number=1, repeat=args.rounds))
+        keyed_time = min(timeit.repeat(lambda: run_keyed(info, check, params),
+                                       number=1, repeat=args.rounds))
+        print("%-28s %8d %8d %10.2fms %10.2fms %7.1fx" %
+              (name, len(info), len(items), baseline_time * 1000, keyed_time * 1000,
+               baseline_time / max(keyed_time, 1e-9)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
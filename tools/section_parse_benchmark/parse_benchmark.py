@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+"""Compare the parse time of ast.literal_eval and json.loads on recorded
+special agent output.
+
+Every line of a sep(0) section is decoded the way the parse functions do it.
+Lines which are JSON are additionally converted to the Python representation
+and vice versa, so the same data is timed in both formats.
+
+USAGE: parse_benchmark.py [-n ROUNDS] AGENT_OUTPUT [AGENT_OUTPUT ...]
+"""
+
+import argparse
+import ast
+import json
+import re
+import sys
+import timeit
+
+SECTION_HEADER = re.compile(r"^<<<([^:>]+)(:[^>]*)?>>>$")
+
+
+def read_sections(path):
+    """Returns the lines of all sep(0) sections of a recorded agent output"""
+    sections = {}
+    current = None
+    with open(path, encoding="utf-8") as agent_output:
+        for line in agent_output:
+            line = line.rstrip("\n")
+            match = SECTION_HEADER.match(line)
+            if match:
+                current = match.group(1) if "sep(0)" in (match.group(2) or "") else None
+                continue
+            if current and line:
+                sections.setdefault(current, []).append(line)
+    return sections
+
+
+def load_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ast.literal_eval(line)
+
+
+def benchmark(lines, rounds):
+    data = [load_line(line) for line in lines]
+    repr_lines = [repr(element) for element in data]
+    json_lines = [json.dumps(element) for element in data]
+    repr_time = min(timeit.repeat(lambda: [ast.literal_eval(line) for line in repr_lines],
+                                  number=1, repeat=rounds))
+    json_time = min(timeit.repeat(lambda: [json.loads(line) for line in json_lines],
+                                  number=1, repeat=rounds))
+    return sum(len(line) for line in repr_lines), repr_time, json_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--rounds", type=int, default=5,
+                        help="Number of runs per section, the fastest one is reported")
+    parser.add_argument("files", nargs="+", help="Recorded agent output")
+    args = parser.parse_args(argv)
+
+    print("%-40s %10s %12s %12s %8s" % ("Section", "Bytes", "literal_eval", "json.loads", "Factor"))
+    total_repr = total_json = 0.0
+    for path in args.files:
+        for name, lines in sorted(read_sections(path).items()):
+            try:
+                size, repr_time, json_time = benchmark(lines, args.rounds)
+            except (ValueError, SyntaxError):
+                sys.stderr.write("%s: section %s is neither JSON nor a Python literal\n" % (path, name))
+                continue
+            total_repr += repr_time
+            total_json += json_time
+            print("%-40s %10d %10.2fms %10.2fms %7.1fx" %
+                  (name, size, repr_time * 1000, json_time * 1000, repr_time / max(json_time, 1e-9)))
+
+    print("%-40s %10s %10.2fms %10.2fms %7.1fx" %
+          ("Total", "", total_repr * 1000, total_json * 1000, total_repr / max(total_json, 1e-9)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())